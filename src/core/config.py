@@ -21,8 +21,14 @@ class Settings(BaseSettings):
     USER_DATA_SCHEMA: Optional[str] = "user_data"
     CUSTOMER_SCHEMA: Optional[str] = "customer"
     REGION_MAPPING_PT_TABLE: Optional[str] = "basic.region_mapping_pt"
+    R5_REGION_CACHE_TTL: Optional[float] = 300.0
     ASYNC_CLIENT_DEFAULT_TIMEOUT: Optional[float] = 5.0
     ASYNC_CLIENT_READ_TIMEOUT: Optional[float] = 15.0
+    ASYNC_CLIENT_MAX_CONNECTIONS: Optional[int] = 200
+    ASYNC_CLIENT_MAX_KEEPALIVE_CONNECTIONS: Optional[int] = 100
+    ASYNC_CLIENT_KEEPALIVE_EXPIRY: Optional[float] = 60.0
+    ISOCHRONE_PT_CONCURRENCY: Optional[int] = 8
+    ISOCHRONE_PT_FAST_JSOLINES: Optional[bool] = True
 
     SENTRY_DSN: Optional[HttpUrl] = None
     POSTGRES_SERVER: str
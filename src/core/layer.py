@@ -26,10 +26,10 @@ from src.core.config import settings
 from src.core.job import job_log
 from src.schemas.job import JobStatusType, Msg, MsgType
 from src.schemas.layer import (
-    NumberColumnsPerType,
+    NUMBER_COLUMNS_PER_TYPE,
     OgrPostgresType,
     OgrDriverType,
-    SupportedOgrGeomType,
+    OGR_GEOM_TO_INTERNAL,
 )
 from src.db.models.layer import (
     FileUploadType,
@@ -237,7 +237,7 @@ class OGRFileHandling:
             geometry_type = ogr.GeometryTypeToName(layer_def.GetGeomType()).replace(
                 " ", "_"
             )
-            if geometry_type not in SupportedOgrGeomType.__members__:
+            if geometry_type not in OGR_GEOM_TO_INTERNAL:
                 return {
                     "msg": "Geometry type not supported.",
                     "status": JobStatusType.failed.value,
@@ -276,7 +276,7 @@ class OGRFileHandling:
 
             # Check if number of specified field excesses the maximum specified number
             if (
-                NumberColumnsPerType[field_type_pg].value
+                NUMBER_COLUMNS_PER_TYPE[field_type_pg]
                 > len(field_types["valid"][field_type_pg])
                 and field_name not in field_types["valid"][field_type_pg]
             ):
@@ -284,7 +284,7 @@ class OGRFileHandling:
 
             # Place fields that are exceeding the maximum number of columns or if the column name was already specified.
             elif (
-                NumberColumnsPerType[field_type_pg]
+                NUMBER_COLUMNS_PER_TYPE[field_type_pg]
                 <= len(field_types["valid"][field_type_pg])
                 or field_name in field_types["valid"][field_type_pg]
             ):
@@ -577,7 +577,7 @@ class OGRFileHandling:
             insert_geom = ""
         else:
             geometry_type = data_types["geometry"]["type"]
-            target_table = f"{settings.USER_DATA_SCHEMA}.{SupportedOgrGeomType[geometry_type].value}_{str(self.user_id).replace('-', '')}"
+            target_table = f"{settings.USER_DATA_SCHEMA}.{OGR_GEOM_TO_INTERNAL[geometry_type]}_{str(self.user_id).replace('-', '')}"
             select_geom = f"{geom_column} as geom, "
             insert_geom = "geom, "
         select_statement = ""
@@ -627,7 +627,7 @@ class OGRFileHandling:
             target_table = f"{settings.USER_DATA_SCHEMA}.no_geometry_{str(self.user_id).replace('-', '')}"
         else:
             geometry_type = data_types["geometry"]["type"]
-            target_table = f"{settings.USER_DATA_SCHEMA}.{SupportedOgrGeomType[geometry_type].value}_{str(self.user_id).replace('-', '')}"
+            target_table = f"{settings.USER_DATA_SCHEMA}.{OGR_GEOM_TO_INTERNAL[geometry_type]}_{str(self.user_id).replace('-', '')}"
 
         await self.upload_ogr2ogr_fail(temp_table_name)
         await self.async_session.execute(
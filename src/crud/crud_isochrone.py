@@ -1,9 +1,14 @@
+import asyncio
+import random
 import time
+from functools import partial
+
 from httpx import AsyncClient
+from sqlalchemy import text
 from src.core.config import settings
 from src.core.job import job_init, job_log, run_background_or_immediately
 from src.core.tool import CRUDToolBase
-from src.jsoline import generate_jsolines
+from src.jsoline import generate_jsolines, generate_jsolines_from_r5_bytes
 from src.schemas.active_mobility import (
     IIsochroneActiveMobility,
     TravelTimeCostActiveMobility,
@@ -20,18 +25,40 @@ from src.schemas.layer import IFeatureLayerToolCreate, UserDataGeomType
 from src.schemas.motorized_mobility import IIsochroneCar, IIsochronePTNew
 from src.schemas.toolbox_base import (
     DefaultResultLayerName,
+    GeofenceTable,
     IsochroneGeometryTypeMapping,
 )
-from src.utils import decode_r5_grid
+from src.utils import decode_r5_grid, get_user_data_table
+
+
+# Per process cache of R5 regions and bounds by exact starting point coordinates.
+# Hits come from rerunning jobs on the same starting point layer with other
+# parameters. Coordinates are not rounded into buckets, as a bucket close to a
+# region border could map a point to the wrong R5 region. Entries expire after
+# R5_REGION_CACHE_TTL seconds so changes of the region mapping (new bundles,
+# moved hosts) are picked up without a restart.
+R5_REGION_CACHE_SIZE = 4096
+r5_region_cache: dict[tuple[float, float], tuple[float, dict]] = {}
 
 
 class CRUDIsochroneBase(CRUDToolBase):
+    RETRY_DELAY = 0.2  # Number of seconds to wait before the first retry
+    MAX_RETRY_DELAY = 4  # Maximum number of seconds to wait between retries
+    RETRY_JITTER = 0.1  # Maximum number of seconds added as random jitter
+
     def __init__(self, job_id, background_tasks, async_session, user_id, project_id):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
-        self.table_starting_points = (
-            f"{settings.USER_DATA_SCHEMA}.point_{str(self.user_id).replace('-', '')}"
+        self.table_starting_points = get_user_data_table(
+            settings.USER_DATA_SCHEMA, UserDataGeomType.point.value, str(self.user_id)
         )
 
+    def get_retry_delay(self, retry: int) -> float:
+        """Get the exponential backoff delay with random jitter for a retry."""
+
+        return min(
+            self.RETRY_DELAY * (2**retry), self.MAX_RETRY_DELAY
+        ) + random.uniform(0, self.RETRY_JITTER)
+
     async def create_layer_starting_points(
         self, params: IIsochroneActiveMobility | IIsochroneCar | IIsochronePTNew
     ) -> IFeatureLayerToolCreate:
@@ -45,79 +72,88 @@ class CRUDIsochroneBase(CRUDToolBase):
             job_id=self.job_id,
         )
 
-        # Check if starting points are within the geofence
-        for i in range(0, len(params.starting_points.latitude), 500):
-            # Create insert query
-            lats = params.starting_points.latitude[i : i + 500]
-            lons = params.starting_points.longitude[i : i + 500]
-            sql = f"""
-                WITH to_test AS
-                (
-                    SELECT ST_SETSRID(ST_MAKEPOINT(lon, lat), 4326) AS geom
-                    FROM UNNEST(ARRAY{str(lats)}) AS lat,
-                    UNNEST(ARRAY{str(lons)}) AS lon
-                )
-                SELECT COUNT(*)
+        # Only known geofence tables are allowed as the name is part of the query
+        geofence_table = GeofenceTable(params.geofence_table).value
+
+        # Check if starting points are within the geofence and save them into the
+        # user data table in a single statement. Points are only inserted if all
+        # of them intersect the geofence.
+        sql = f"""
+            WITH to_test AS
+            (
+                SELECT ST_SETSRID(ST_MAKEPOINT(lon, lat), 4326) AS geom
+                FROM UNNEST(CAST(:lats AS float8[]), CAST(:lons AS float8[])) AS t(lat, lon)
+            ),
+            not_intersecting AS
+            (
+                SELECT COUNT(*) AS cnt
                 FROM to_test t
                 WHERE NOT EXISTS (
                     SELECT 1
-                    FROM {params.geofence_table} AS g
-                    WHERE ST_INTERSECTS(t.geom, g.geom)
-                )
-            """
-            # Execute query
-            cnt_not_intersecting = await self.async_session.execute(sql)
-            cnt_not_intersecting = cnt_not_intersecting.scalars().first()
-
-            if cnt_not_intersecting > 0:
-                raise OutOfGeofenceError(
-                    f"There are {cnt_not_intersecting} starting points that are not within the geofence. Please check your starting points."
+                    FROM {geofence_table} AS g
+                    WHERE g.geom && t.geom
+                    AND ST_INTERSECTS(t.geom, g.geom)
                 )
-
-        # Save data into user data tables in batches of 500
-        for i in range(0, len(params.starting_points.latitude), 500):
-            # Create insert query
-            lats = params.starting_points.latitude[i : i + 500]
-            lons = params.starting_points.longitude[i : i + 500]
-            sql = f"""
+            ),
+            inserted AS
+            (
                 INSERT INTO {self.table_starting_points} (layer_id, geom)
-                SELECT '{layer.id}', ST_SETSRID(ST_MAKEPOINT(lon, lat), 4326) AS geom
-                FROM UNNEST(ARRAY{str(lats)}) AS lat,
-                UNNEST(ARRAY{str(lons)}) AS lon
-            """
-            # Execute query
-            await self.async_session.execute(sql)
+                SELECT CAST(:layer_id AS uuid), t.geom
+                FROM to_test t, not_intersecting n
+                WHERE n.cnt = 0
+                RETURNING 1
+            )
+            SELECT cnt
+            FROM not_intersecting
+        """
+        # Execute query
+        cnt_not_intersecting = await self.async_session.execute(
+            text(sql),
+            {
+                "layer_id": str(layer.id),
+                "lats": params.starting_points.latitude,
+                "lons": params.starting_points.longitude,
+            },
+        )
+        cnt_not_intersecting = cnt_not_intersecting.scalars().first()
+
+        if cnt_not_intersecting > 0:
+            raise OutOfGeofenceError(
+                f"There are {cnt_not_intersecting} starting points that are not within the geofence. Please check your starting points."
+            )
 
         return layer
 
     async def get_lats_lons(
         self, params: IIsochroneActiveMobility | IIsochroneCar | IIsochronePTNew
     ):
-        # Check if starting points are a layer else create layer
-        if params.starting_points.layer_project_id:
-            layer_starting_points = await self.get_layers_project(params)
-            where_query = layer_starting_points["layer_project_id"].where_query
-            table_name = layer_starting_points["layer_project_id"].table_name
-        else:
+        # Create layer if starting points are passed as coordinates. The coordinates
+        # are used as they are, no need to read them back from the database.
+        if not params.starting_points.layer_project_id:
             layer_starting_points = await self.create_layer_starting_points(
                 params=params
             )
-            where_query = f"layer_id = '{layer_starting_points.id}'"
-            table_name = self.table_starting_points
+            return {
+                "layer_starting_points": layer_starting_points,
+                "lats": list(params.starting_points.latitude),
+                "lons": list(params.starting_points.longitude),
+            }
+
+        # Get starting points from the layer
+        layer_starting_points = await self.get_layers_project(params)
+        where_query = layer_starting_points["layer_project_id"].where_query
+        table_name = layer_starting_points["layer_project_id"].table_name
 
         sql = f"""
-            SELECT ST_X(geom) AS lon, ST_Y(geom) AS lat
+            SELECT ARRAY_AGG(ST_X(geom)) AS lons, ARRAY_AGG(ST_Y(geom)) AS lats
             FROM {table_name}
             WHERE {where_query};
         """
-        starting_points = (await self.async_session.execute(sql)).fetchall()
-        starting_points = [dict(x) for x in starting_points]
-        lats = [x["lat"] for x in starting_points]
-        lons = [x["lon"] for x in starting_points]
+        lons, lats = (await self.async_session.execute(text(sql))).fetchone()
         return {
             "layer_starting_points": layer_starting_points,
-            "lats": lats,
-            "lons": lons,
+            "lats": lats or [],
+            "lons": lons or [],
         }
 
 
@@ -134,8 +170,8 @@ class CRUDIsochroneActiveMobility(CRUDIsochroneBase):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
 
         self.http_client = http_client
-        self.NUM_RETRIES = 5  # Number of times to retry calling the endpoint
-        self.RETRY_DELAY = 2  # Number of seconds to wait between retries
+        # Waits about 10 s in total before giving up, close to the former 8 s
+        self.NUM_RETRIES = 7  # Number of times to retry calling the endpoint
 
     @job_log(job_step_name="isochrone")
     async def isochrone(
@@ -160,7 +196,11 @@ class CRUDIsochroneActiveMobility(CRUDIsochroneBase):
             tool_type=params.tool_type.value,
             job_id=self.job_id,
         )
-        result_table = f"{settings.USER_DATA_SCHEMA}.{layer_isochrone.feature_layer_geometry_type.value}_{str(self.user_id).replace('-', '')}"
+        result_table = get_user_data_table(
+            settings.USER_DATA_SCHEMA,
+            layer_isochrone.feature_layer_geometry_type.value,
+            str(self.user_id),
+        )
 
         # Construct request payload
         request_payload = {
@@ -188,7 +228,7 @@ class CRUDIsochroneActiveMobility(CRUDIsochroneBase):
         }
 
         try:
-            # Call GOAT Routing endpoint multiple times for upto 20 seconds / 10 retries
+            # Call GOAT Routing endpoint multiple times with exponential backoff
             for i in range(self.NUM_RETRIES):
                 # Call GOAT Routing endpoint to compute isochrone
                 response = await self.http_client.post(
@@ -202,7 +242,7 @@ class CRUDIsochroneActiveMobility(CRUDIsochroneBase):
                         raise Exception(
                             "GOAT routing endpoint took too long to process request."
                         )
-                    time.sleep(self.RETRY_DELAY)
+                    await asyncio.sleep(self.get_retry_delay(i))
                     continue
                 elif response.status_code == 201:
                     # Endpoint has finished processing request, break
@@ -249,8 +289,12 @@ class CRUDIsochronePT(CRUDIsochroneBase):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
 
         self.http_client = http_client
-        self.NUM_RETRIES = 10  # Number of times to retry calling the endpoint
-        self.RETRY_DELAY = 2  # Number of seconds to wait between retries
+        # Limit the number of starting points processed concurrently
+        self.semaphore = asyncio.Semaphore(settings.ISOCHRONE_PT_CONCURRENCY)
+        # Serialize database access as all starting points share the same session
+        self.session_lock = asyncio.Lock()
+        # Waits about 18 s in total before giving up, same as before
+        self.NUM_RETRIES = 9  # Number of times to retry calling the endpoint
 
     async def write_isochrone_result(
         self, isochrone_type, layer_id, result_table, shapes, grid
@@ -260,136 +304,114 @@ class CRUDIsochronePT(CRUDIsochroneBase):
         if isochrone_type == "polygon":
             # Save isochrone geometry data (shapes)
             shapes = shapes["incremental"]
-            insert_string = ""
-            for i in shapes.index:
-                geom = shapes["geometry"][i]
-                minute = shapes["minute"][i]
-                insert_string += f"('{layer_id}', ST_SetSRID(ST_GeomFromText('{geom}'), 4326), {minute}),"
-            insert_string = f"""
+            sql = f"""
                 INSERT INTO {result_table} (layer_id, geom, integer_attr1)
-                VALUES {insert_string.rstrip(",")};
+                SELECT CAST(:layer_id AS uuid), ST_SetSRID(ST_GeomFromWKB(geom), 4326), minute
+                FROM UNNEST(CAST(:geoms AS bytea[]), CAST(:minutes AS float8[])) AS t(geom, minute)
             """
-            await self.async_session.execute(insert_string)
+            await self.async_session.execute(
+                text(sql),
+                {
+                    "layer_id": layer_id,
+                    "geoms": shapes.geometry.to_wkb().tolist(),
+                    "minutes": shapes["minute"].astype(float).tolist(),
+                },
+            )
         else:
             # Save isochrone grid data
             pass
 
-    @job_log(job_step_name="isochrone")
-    async def isochrone(
+    async def get_r5_regions(self, lats: list[float], lons: list[float]) -> list[dict]:
+        """Get the relevant R5 region, bundle and region bounds for all starting points."""
+
+        # TODO Compute buffer distance dynamically?
+        sql = f"""
+            WITH pt AS
+            (
+                SELECT i, ST_SETSRID(ST_MAKEPOINT(lon, lat), 4326) AS geom
+                FROM UNNEST(CAST(:lons AS float8[]), CAST(:lats AS float8[]))
+                WITH ORDINALITY AS t(lon, lat, i)
+            )
+            SELECT DISTINCT ON (pt.i) pt.i, r.r5_region_id, r.r5_bundle_id, r.r5_host,
+            ST_XMin(b.geom) AS xmin, ST_YMin(b.geom) AS ymin,
+            ST_XMax(b.geom) AS xmax, ST_YMax(b.geom) AS ymax
+            FROM pt
+            JOIN {settings.REGION_MAPPING_PT_TABLE} r
+            ON ST_INTERSECTS(pt.geom, ST_SetSRID(r.geom, 4326))
+            CROSS JOIN LATERAL (
+                SELECT ST_Envelope(
+                    ST_Buffer(pt.geom::geography, 100000)::geometry
+                ) AS geom
+            ) b
+            ORDER BY pt.i;
+        """
+        # Only query the starting points which are not cached or expired
+        coordinates = list(zip(lons, lats))
+        now = time.monotonic()
+        regions = {}
+        for c in coordinates:
+            cached = r5_region_cache.get(c)
+            if cached and now - cached[0] < settings.R5_REGION_CACHE_TTL:
+                regions[c] = cached[1]
+        missing = list({c for c in coordinates if c not in regions})
+
+        if missing:
+            result = await self.async_session.execute(
+                text(sql),
+                {"lons": [c[0] for c in missing], "lats": [c[1] for c in missing]},
+            )
+            rows = result.mappings().fetchall()
+
+            # Check if a region was found for each starting point
+            if len(rows) != len(missing):
+                raise R5EndpointError(
+                    "There are starting points that are not covered by an R5 region."
+                )
+
+            # Reset the cache once it exceeds its maximum size
+            if len(r5_region_cache) + len(rows) > R5_REGION_CACHE_SIZE:
+                r5_region_cache.clear()
+            for c, row in zip(missing, rows):
+                regions[c] = dict(row)
+                r5_region_cache[c] = (now, regions[c])
+
+        return [regions[c] for c in coordinates]
+
+    async def isochrone_starting_point(
         self,
         params: IIsochronePTNew,
+        lat: float,
+        lon: float,
+        region: dict,
+        request_payload: dict,
+        layer_id: str,
+        result_table: str,
     ):
-        """Compute public transport isochrone using R5 routing endpoint."""
+        """Compute public transport isochrone for a single starting point and save the result."""
 
-        # Fetch starting points from previously created layer if required
-        starting_pojnts = await self.get_lats_lons(params=params)
-        lats = starting_pojnts["lats"]
-        lons = starting_pojnts["lons"]
-        layer_starting_points = starting_pojnts["layer_starting_points"]
-
-
-        # Create feature layer to store computed isochrone output
-        layer_isochrone = IFeatureLayerToolCreate(
-            name=DefaultResultLayerName.isochrone_pt.value,
-            feature_layer_geometry_type=IsochroneGeometryTypeMapping[
-                params.isochrone_type.value
-            ],
-            attribute_mapping={"integer_attr1": "travel_cost"},
-            tool_type=params.tool_type.value,
-            job_id=self.job_id,
-        )
-        result_table = f"{settings.USER_DATA_SCHEMA}.{layer_isochrone.feature_layer_geometry_type.value}_{str(self.user_id).replace('-', '')}"
-
-        # Compute isochrone for each starting point
-        for i in range(0, len(params.starting_points.latitude)):
-            # Identify relevant R5 region & bundle for this isochrone starting point
-            sql_get_region_mapping = f"""
-                SELECT r5_region_id, r5_bundle_id, r5_host
-                FROM {settings.REGION_MAPPING_PT_TABLE}
-                WHERE ST_INTERSECTS(
-                    ST_SETSRID(
-                        ST_MAKEPOINT(
-                            {params.starting_points.longitude[i]},
-                            {params.starting_points.latitude[i]}
-                        ),
-                        4326
-                    ),
-                    ST_SetSRID(geom, 4326)
-                );
-            """
-            r5_region_id, r5_bundle_id, r5_host = (
-                await self.async_session.execute(sql_get_region_mapping)
-            ).fetchall()[0]
-
-            # Get relevant region bounds for this starting point
-            # TODO Compute buffer distance dynamically?
-            sql_get_region_bounds = f"""
-                SELECT ST_XMin(b.geom), ST_YMin(b.geom), ST_XMax(b.geom), ST_YMax(b.geom)
-                FROM (
-                    SELECT ST_Envelope(
-                        ST_Buffer(
-                            ST_SetSRID(
-                                ST_MakePoint(
-                                    {lons[i]},
-                                    {lats[i]}),
-                                4326
-                            )::geography,
-                            100000
-                        )::geometry
-                    ) AS geom
-                ) b;
-            """
-            xmin, ymin, xmax, ymax = (
-                await self.async_session.execute(sql_get_region_bounds)
-            ).fetchall()[0]
-
-            # Construct request payload
-            request_payload = {
-                "accessModes": params.routing_type.access_mode.value.upper(),
-                "transitModes": ",".join(params.routing_type.mode).upper(),
-                "bikeSpeed": params.bike_speed,
-                "walkSpeed": params.walk_speed,
-                "bikeTrafficStress": params.bike_traffic_stress,
-                "date": params.time_window.weekday_date,
-                "fromTime": params.time_window.from_time,
-                "toTime": params.time_window.to_time,
-                "maxTripDurationMinutes": params.travel_cost.max_traveltime,
-                "decayFunction": {
-                    "type": "logistic",
-                    "standard_deviation_minutes": params.decay_function.standard_deviation_minutes,
-                    "width_minutes": params.decay_function.width_minutes,
-                },
-                "destinationPointSetIds": [],
+        async with self.semaphore:
+            # Complete request payload with the starting point specific values
+            request_payload = request_payload | {
                 "bounds": {
-                    "north": ymax,
-                    "south": ymin,
-                    "east": xmax,
-                    "west": xmin,
+                    "north": region["ymax"],
+                    "south": region["ymin"],
+                    "east": region["xmax"],
+                    "west": region["xmin"],
                 },
-                "directModes": params.routing_type.access_mode.value.upper(),
-                "egressModes": params.routing_type.egress_mode.value.upper(),
-                "fromLat": lats[i],
-                "fromLon": lons[i],
-                "zoom": params.zoom,
-                "maxBikeTime": params.max_bike_time,
-                "maxRides": params.max_rides,
-                "maxWalkTime": params.max_walk_time,
-                "monteCarloDraws": params.monte_carlo_draws,
-                "percentiles": params.percentiles,
-                "variantIndex": settings.R5_VARIANT_INDEX,
-                "workerVersion": settings.R5_WORKER_VERSION,
-                "regionId": r5_region_id,
-                "projectId": r5_region_id,
-                "bundleId": r5_bundle_id,
+                "fromLat": lat,
+                "fromLon": lon,
+                "regionId": region["r5_region_id"],
+                "projectId": region["r5_region_id"],
+                "bundleId": region["r5_bundle_id"],
             }
 
             result = None
             try:
-                # Call R5 endpoint multiple times for upto 20 seconds / 10 retries
+                # Call R5 endpoint multiple times with exponential backoff
                 for i in range(self.NUM_RETRIES):
                     # Call R5 endpoint to compute isochrone
                     response = await self.http_client.post(
-                        url=f"{r5_host}/api/analysis",
+                        url=f"{region['r5_host']}/api/analysis",
                         json=request_payload,
                         headers={"Authorization": settings.R5_AUTHORIZATION},
                     )
@@ -399,7 +421,7 @@ class CRUDIsochronePT(CRUDIsochroneBase):
                             raise Exception(
                                 "R5 engine took too long to process request."
                             )
-                        time.sleep(self.RETRY_DELAY)
+                        await asyncio.sleep(self.get_retry_delay(i))
                         continue
                     elif response.status_code == 200:
                         # Engine has finished processing request, break
@@ -413,16 +435,41 @@ class CRUDIsochronePT(CRUDIsochroneBase):
             isochrone_grid = None
             isochrone_shapes = None
             try:
-                # Decode R5 response data
-                isochrone_grid = decode_r5_grid(result)
-
-                # Convert grid data returned by R5 to valid isochrone geometry
-                isochrone_shapes = generate_jsolines(
-                    grid=isochrone_grid,
-                    travel_time=params.travel_cost.max_traveltime,
-                    percentile=5,
-                    steps=params.travel_cost.steps,
-                )
+                # Run CPU bound processing in an executor to not block the event loop
+                loop = asyncio.get_running_loop()
+
+                if (
+                    settings.ISOCHRONE_PT_FAST_JSOLINES
+                    and params.isochrone_type.value == "polygon"
+                ):
+                    # Convert raw R5 response to isochrone geometry in a single pass
+                    isochrone_shapes = await loop.run_in_executor(
+                        None,
+                        partial(
+                            generate_jsolines_from_r5_bytes,
+                            result=result,
+                            travel_time=params.travel_cost.max_traveltime,
+                            percentile=5,
+                            steps=params.travel_cost.steps,
+                        ),
+                    )
+                else:
+                    # Decode R5 response data
+                    isochrone_grid = await loop.run_in_executor(
+                        None, decode_r5_grid, result
+                    )
+
+                    # Convert grid data returned by R5 to valid isochrone geometry
+                    isochrone_shapes = await loop.run_in_executor(
+                        None,
+                        partial(
+                            generate_jsolines,
+                            grid=isochrone_grid,
+                            travel_time=params.travel_cost.max_traveltime,
+                            percentile=5,
+                            steps=params.travel_cost.steps,
+                        ),
+                    )
             except Exception as e:
                 raise R5IsochroneComputeError(
                     f"Error while processing R5 isochrone grid: {str(e)}"
@@ -430,30 +477,137 @@ class CRUDIsochronePT(CRUDIsochroneBase):
 
             try:
                 # Save result to database
-                await self.write_isochrone_result(
-                    isochrone_type=params.isochrone_type.value,
-                    layer_id=str(layer_isochrone.id),
-                    result_table=result_table,
-                    shapes=isochrone_shapes,
-                    grid=isochrone_grid,
-                )
+                async with self.session_lock:
+                    await self.write_isochrone_result(
+                        isochrone_type=params.isochrone_type.value,
+                        layer_id=layer_id,
+                        result_table=result_table,
+                        shapes=isochrone_shapes,
+                        grid=isochrone_grid,
+                    )
             except Exception as e:
                 raise SQLError(
                     f"Error while saving R5 isochrone result to database: {str(e)}"
                 )
 
-            # Create new layers.
-            await self.create_feature_layer_tool(
-                layer_in=layer_isochrone,
-                params=params,
-            )
-            # Create new layer if starting points are not a layer
-            if not params.starting_points.layer_project_id:
-                await self.create_feature_layer_tool(
-                    layer_in=layer_starting_points,
+    async def isochrone_starting_points(
+        self,
+        params: IIsochronePTNew,
+        lats: list[float],
+        lons: list[float],
+        regions: list[dict],
+        request_payload: dict,
+        layer_id: str,
+        result_table: str,
+    ):
+        """Compute public transport isochrones for all starting points concurrently."""
+
+        tasks = [
+            asyncio.create_task(
+                self.isochrone_starting_point(
                     params=params,
+                    lat=lat,
+                    lon=lon,
+                    region=region,
+                    request_payload=request_payload,
+                    layer_id=layer_id,
+                    result_table=result_table,
                 )
+            )
+            for lat, lon, region in zip(lats, lons, regions)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other starting points as they share the session with the job
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @job_log(job_step_name="isochrone")
+    async def isochrone(
+        self,
+        params: IIsochronePTNew,
+    ):
+        """Compute public transport isochrone using R5 routing endpoint."""
+
+        # Fetch starting points from previously created layer if required
+        starting_pojnts = await self.get_lats_lons(params=params)
+        lats = starting_pojnts["lats"]
+        lons = starting_pojnts["lons"]
+        layer_starting_points = starting_pojnts["layer_starting_points"]
 
+        # Create feature layer to store computed isochrone output
+        layer_isochrone = IFeatureLayerToolCreate(
+            name=DefaultResultLayerName.isochrone_pt.value,
+            feature_layer_geometry_type=IsochroneGeometryTypeMapping[
+                params.isochrone_type.value
+            ],
+            attribute_mapping={"integer_attr1": "travel_cost"},
+            tool_type=params.tool_type.value,
+            job_id=self.job_id,
+        )
+        result_table = get_user_data_table(
+            settings.USER_DATA_SCHEMA,
+            layer_isochrone.feature_layer_geometry_type.value,
+            str(self.user_id),
+        )
+
+        # Identify relevant R5 region, bundle and bounds for all starting points
+        regions = await self.get_r5_regions(lats=lats, lons=lons)
+
+        # Construct request payload shared by all starting points
+        request_payload = {
+            "accessModes": params.routing_type.access_mode.value.upper(),
+            "transitModes": ",".join(params.routing_type.mode).upper(),
+            "bikeSpeed": params.bike_speed,
+            "walkSpeed": params.walk_speed,
+            "bikeTrafficStress": params.bike_traffic_stress,
+            "date": params.time_window.weekday_date,
+            "fromTime": params.time_window.from_time,
+            "toTime": params.time_window.to_time,
+            "maxTripDurationMinutes": params.travel_cost.max_traveltime,
+            "decayFunction": {
+                "type": "logistic",
+                "standard_deviation_minutes": params.decay_function.standard_deviation_minutes,
+                "width_minutes": params.decay_function.width_minutes,
+            },
+            "destinationPointSetIds": [],
+            "directModes": params.routing_type.access_mode.value.upper(),
+            "egressModes": params.routing_type.egress_mode.value.upper(),
+            "zoom": params.zoom,
+            "maxBikeTime": params.max_bike_time,
+            "maxRides": params.max_rides,
+            "maxWalkTime": params.max_walk_time,
+            "monteCarloDraws": params.monte_carlo_draws,
+            "percentiles": params.percentiles,
+            "variantIndex": settings.R5_VARIANT_INDEX,
+            "workerVersion": settings.R5_WORKER_VERSION,
+        }
+
+        # Compute isochrones for all starting points concurrently
+        await self.isochrone_starting_points(
+            params=params,
+            lats=lats,
+            lons=lons,
+            regions=regions,
+            request_payload=request_payload,
+            layer_id=str(layer_isochrone.id),
+            result_table=result_table,
+        )
+
+        # Create new layers.
+        await self.create_feature_layer_tool(
+            layer_in=layer_isochrone,
+            params=params,
+        )
+        # Create new layer if starting points are not a layer
+        if not params.starting_points.layer_project_id:
+            await self.create_feature_layer_tool(
+                layer_in=layer_starting_points,
+                params=params,
+            )
 
         return {
             "status": JobStatusType.finished.value,
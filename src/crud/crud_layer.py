@@ -44,7 +44,7 @@ from src.schemas.layer import (
     IUniqueValue,
     LayerType,
     OgrDriverType,
-    SupportedOgrGeomType,
+    OGR_GEOM_TO_INTERNAL,
     UserDataGeomType,
     get_layer_schema,
     layer_update_class,
@@ -109,9 +109,9 @@ class CRUDLayer(CRUDBase):
 
         # Get default style if feature layer
         if file_metadata["data_types"].get("geometry"):
-            geom_type = SupportedOgrGeomType[
+            geom_type = OGR_GEOM_TO_INTERNAL[
                 file_metadata["data_types"]["geometry"]["type"]
-            ].value
+            ]
             additional_attributes["properties"] = get_base_style(
                 feature_geometry_type=geom_type
             )
@@ -41,11 +41,8 @@ class CRUDLayerProject(CRUDBase):
             else:
                 layer_type = layer.type
 
-            layer_dict = layer.dict()
-            # Delete id from layer
-            del layer_dict["id"]
-            # Update layer with layer project
-            layer_dict.update(layer_project.dict())
+            # Merge layer without its id and layer project in one dict
+            layer_dict = {**layer.dict(exclude={"id"}), **layer_project.dict()}
             layer_project = layer_type_mapping_read[layer_type](**layer_dict)
 
             # Get feature cnt for all feature layers and tables
@@ -1,5 +1,4 @@
 import json
-from datetime import timedelta
 from pydantic import BaseModel
 
 
@@ -10,7 +9,7 @@ from src.schemas.motorized_mobility import (
     public_transport_types,
     INearbyStationAccess,
 )
-from src.utils import build_where_clause
+from src.utils import build_where_clause, get_user_data_table
 from src.db.models.layer import ToolType
 from src.schemas.toolbox_base import DefaultResultLayerName
 from src.schemas.layer import IFeatureLayerToolCreate, UserDataGeomType
@@ -20,17 +19,36 @@ from src.schemas.job import JobType, JobStatusOevGueteklasse, JobStatusType
 from src.core.job import job_log, job_init, run_background_or_immediately
 from src.core.config import settings
 
+# Public transport modes and result attributes of the trip count
+PT_MODES = list(public_transport_types.keys()) + ["total"]
+TRIP_COUNT_ATTRIBUTE_MAPPING = {
+    "text_attr1": "stop_id",
+    "text_attr2": "stop_name",
+    "jsonb_attr1": "trip_cnt",
+} | {f"integer_attr{i+1}": pt_mode for i, pt_mode in enumerate(PT_MODES)}
+
+# Mapping of the GTFS route types to the public transport modes
+FLAT_MODE_MAPPING_JSON = json.dumps(
+    {
+        str(inner_key): outer_key
+        for outer_key, inner_dict in public_transport_types.items()
+        for inner_key in inner_dict
+    }
+)
+
 
 class CRUDOevGueteklasse(CRUDToolBase):
     """CRUD for OEV-Gueteklasse."""
 
     def __init__(self, job_id, background_tasks, async_session, user_id, project_id):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
-        self.table_stations = (
-            f"{settings.USER_DATA_SCHEMA}.point_{str(self.user_id).replace('-', '')}"
+        self.table_stations = get_user_data_table(
+            settings.USER_DATA_SCHEMA, UserDataGeomType.point.value, str(self.user_id)
         )
-        self.table_oev_gueteklasse = (
-            f"{settings.USER_DATA_SCHEMA}.polygon_{str(self.user_id).replace('-', '')}"
+        self.table_oev_gueteklasse = get_user_data_table(
+            settings.USER_DATA_SCHEMA,
+            UserDataGeomType.polygon.value,
+            str(self.user_id),
         )
 
     @job_log(job_step_name="station_category")
@@ -46,21 +64,29 @@ class CRUDOevGueteklasse(CRUDToolBase):
         query = f"""
             INSERT INTO {self.table_stations}({', '.join(station_category_layer.attribute_mapping.keys())}, layer_id, geom)
             WITH stations AS (
-                SELECT stop_id, stop_name, (oev_gueteklasse ->> 'frequency')::float AS frequency,
-                (oev_gueteklasse ->> '_class')::integer AS _class, '{str(station_category_layer.id)}'::uuid AS layer_id, geom AS geom
+                SELECT stop_id, stop_name, oev_gueteklasse.frequency,
+                oev_gueteklasse._class, CAST(:layer_id AS uuid) AS layer_id, geom AS geom
                 FROM basic.count_public_transport_services_station(
-                    '{reference_layer_project.table_name}',
+                    :table_area,
                     :where_query,
-                    '{str(timedelta(seconds=params.time_window.from_time))}',
-                    '{str(timedelta(seconds=params.time_window.to_time))}',
+                    '{params.time_window.from_time_interval}',
+                    '{params.time_window.to_time_interval}',
                     {params.time_window.weekday_integer}
-                ) s, LATERAL basic.oev_guetklasse_station_category(trip_cnt, '{json.dumps(params.station_config.dict())}'::jsonb,
+                ) s, LATERAL basic.oev_guetklasse_station_category(trip_cnt, CAST(:station_config AS jsonb),
                 {params.time_window.from_time}, {params.time_window.to_time}) oev_gueteklasse
             )
             SELECT *
             FROM stations
         """
-        await self.async_session.execute(query, {"where_query": where_query})
+        await self.async_session.execute(
+            query,
+            {
+                "layer_id": str(station_category_layer.id),
+                "table_area": reference_layer_project.table_name,
+                "where_query": where_query,
+                "station_config": json.dumps(params.station_config.dict()),
+            },
+        )
         await self.async_session.commit()
         return {
             "status": JobStatusType.finished.value,
@@ -77,9 +103,19 @@ class CRUDOevGueteklasse(CRUDToolBase):
         """Compute station buffer."""
 
         # Create temp table names
-        table_suffix = str(self.job_id).replace("-", "")
+        table_suffix = self.job_id.hex
         temp_buffered_stations = f"temporal.temp_buffered_stations_{table_suffix}"
         temp_union_buffer = f"temporal.temp_union_buffered_stations_{table_suffix}"
+        temp_subdivided_buffer = (
+            f"temporal.temp_subdivided_buffered_stations_{table_suffix}"
+        )
+
+        # Flatten the classification into station category, buffer size and pt class rows
+        classification = ", ".join(
+            f"({int(station_category)}, {int(buffer_size)}, {int(pt_class)})"
+            for station_category, buffers in station_config["classification"].items()
+            for buffer_size, pt_class in buffers.items()
+        ) or "(NULL::integer, NULL::integer, NULL::integer)"
 
         try:
             # Create temp distributed table for buffered stations
@@ -95,53 +131,64 @@ class CRUDOevGueteklasse(CRUDToolBase):
                     buffer_size integer,
                     geom geometry,
                     h3_3 integer
-                )
-            """
+                );
+                """
             )
             await self.async_session.execute(
-                f"SELECT create_distributed_table('{temp_buffered_stations}', 'h3_3')"
+                f"SELECT create_distributed_table('{temp_buffered_stations}', 'h3_3');"
             )
 
             # Buffer the stations in their respective intervals
             await self.async_session.execute(
-                f"""INSERT INTO {temp_buffered_stations}
-                SELECT text_attr1 AS stop_id,  REPLACE(j.value::TEXT, '"', '')::integer AS pt_class,
-                j.KEY::integer buffer_size, ST_BUFFER(s.geom::geography, j.KEY::integer)::geometry AS geom,
-                basic.to_short_h3_3(h3_lat_lng_to_cell(geom::point, 3)::bigint)
+                f"""
+                INSERT INTO {temp_buffered_stations}
+                SELECT s.text_attr1 AS stop_id, c.pt_class, c.buffer_size,
+                ST_BUFFER(s.geom::geography, c.buffer_size)::geometry AS geom,
+                basic.to_short_h3_3(h3_lat_lng_to_cell(s.geom::point, 3)::bigint)
                 FROM {self.table_stations} s
-                , LATERAL jsonb_each('{json.dumps(station_config)}'::jsonb -> 'classification' -> s.integer_attr1::text) j
-                WHERE layer_id = '{station_category_layer.id}';
+                JOIN (VALUES {classification}) AS c(station_category, buffer_size, pt_class)
+                ON s.integer_attr1 = c.station_category
+                WHERE s.layer_id = '{station_category_layer.id}';
                 """
             )
-            await self.async_session.execute(
-                f"""CREATE INDEX ON {temp_buffered_stations} USING GIST(h3_3, geom);"""
-            )
 
             # Union the buffers. It is not made use of citus distribution column here as it is a challenge to group over shards efficiently.
             await self.async_session.execute(
                 f"DROP TABLE IF EXISTS {temp_union_buffer};"
             )
             await self.async_session.execute(
-                f"""CREATE TABLE {temp_union_buffer} AS
+                f"""
+                CREATE TABLE {temp_union_buffer} AS
                 WITH clustered_buffer AS
                 (
-                    SELECT s.geom, s.pt_class, 
+                    SELECT s.geom, s.pt_class,
                     ST_ClusterDBSCAN(geom, eps := 0, minpoints := 1) OVER (PARTITION BY pt_class) AS cluster_id
                     FROM {temp_buffered_stations} s
                 )
-                SELECT b.pt_class, b.geom
-                FROM clustered_buffer b
-                WHERE cluster_id IS NULL
-                UNION ALL
                 SELECT b.pt_class, ST_UNION(b.geom) AS geom
                 FROM clustered_buffer b
-                WHERE cluster_id IS NOT NULL
-                GROUP BY b.pt_class, cluster_id;"""
+                GROUP BY b.pt_class, cluster_id;
+                """
             )
+
+            # Subdivide the unioned buffers to make the intersects lookup more selective.
+            # The highest class is never subtracted from another class and can be skipped.
             await self.async_session.execute(
-                f"""CREATE INDEX ON {temp_union_buffer} USING GIST(geom);"""
+                f"DROP TABLE IF EXISTS {temp_subdivided_buffer};"
             )
-            # Create difference between different buffers*
+            await self.async_session.execute(
+                f"""
+                CREATE TABLE {temp_subdivided_buffer} AS
+                SELECT b.pt_class, ST_SUBDIVIDE(b.geom, 256) AS geom
+                FROM {temp_union_buffer} b
+                WHERE b.pt_class < (SELECT MAX(pt_class) FROM {temp_union_buffer});
+                """
+            )
+            await self.async_session.execute(
+                f"CREATE INDEX ON {temp_subdivided_buffer} USING SPGIST(geom);"
+            )
+
+            # Create difference between different buffers
             await self.async_session.execute(
                 f"""
                 INSERT INTO {self.table_oev_gueteklasse} (text_attr1, layer_id, geom)
@@ -152,28 +199,25 @@ class CRUDOevGueteklasse(CRUDToolBase):
                     SELECT ST_DIFFERENCE(a.geom, c.geom) AS geom
                     FROM (
                         SELECT ST_UNION(b.geom) geom
-                        FROM {temp_union_buffer} b
-                        WHERE a.pt_class > b.pt_class
+                        FROM {temp_subdivided_buffer} b
+                        -- Implied by a.pt_class > b.pt_class, kept as a one-time filter so the planner skips the lowest class
+                        WHERE a.pt_class > (SELECT MIN(pt_class) FROM {temp_union_buffer})
+                        AND a.pt_class > b.pt_class
                         AND ST_Intersects(a.geom, b.geom)
                     ) c
                 ) j ON TRUE;
                 """
             )
+
             # Drop temp tables
             await self.async_session.execute(
-                f"DROP TABLE IF EXISTS {temp_buffered_stations};"
-            )
-            await self.async_session.execute(
-                f"DROP TABLE IF EXISTS {temp_union_buffer};"
+                f"DROP TABLE IF EXISTS {temp_buffered_stations}, {temp_union_buffer}, {temp_subdivided_buffer};"
             )
             await self.async_session.commit()
         except Exception as e:
             # Drop temp tables
             await self.async_session.execute(
-                f"DROP TABLE IF EXISTS {temp_buffered_stations};"
-            )
-            await self.async_session.execute(
-                f"DROP TABLE IF EXISTS {temp_union_buffer};"
+                f"DROP TABLE IF EXISTS {temp_buffered_stations}, {temp_union_buffer}, {temp_subdivided_buffer};"
             )
             await self.async_session.commit()
             raise SQLError(e)
@@ -250,8 +294,8 @@ class CRUDTripCountStation(CRUDToolBase):
 
     def __init__(self, job_id, background_tasks, async_session, user_id, project_id):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
-        self.result_table = (
-            f"{settings.USER_DATA_SCHEMA}.point_{str(self.user_id).replace('-', '')}"
+        self.result_table = get_user_data_table(
+            settings.USER_DATA_SCHEMA, UserDataGeomType.point.value, str(self.user_id)
         )
 
     @job_log(job_step_name="trip_count_station")
@@ -261,51 +305,37 @@ class CRUDTripCountStation(CRUDToolBase):
         layer_project = layer_project["reference_area_layer_project_id"]
 
         # Create result layer object
-        pt_modes = list(public_transport_types.keys())
-        pt_modes.append("total")
-
-        # Populate attribute mapping with pt_modes as integer
-        attribute_mapping = {
-            f"integer_attr{i+1}": pt_mode for i, pt_mode in enumerate(pt_modes)
-        }
-        attribute_mapping = {
-            "text_attr1": "stop_id",
-            "text_attr2": "stop_name",
-            "jsonb_attr1": "trip_cnt",
-        } | attribute_mapping
-
         result_layer = IFeatureLayerToolCreate(
             name=DefaultResultLayerName.trip_count_station.value,
             feature_layer_geometry_type=UserDataGeomType.point.value,
-            attribute_mapping=attribute_mapping,
+            attribute_mapping=TRIP_COUNT_ATTRIBUTE_MAPPING,
             tool_type=ToolType.trip_count_station.value,
             job_id=self.job_id,
         )
 
-        # Create mapping for transport modes
-        flat_mode_mapping = {}
-        for outer_key, inner_dict in public_transport_types.items():
-            for inner_key in inner_dict:
-                flat_mode_mapping[str(inner_key)] = outer_key
-
         # Get trip count using sql function
         sql_query = f"""
             INSERT INTO {self.result_table}(layer_id, geom, {', '.join(result_layer.attribute_mapping.keys())})
-            SELECT '{str(result_layer.id)}', s.geom, s.stop_id, s.stop_name, s.trip_cnt,
-            (summarized ->> 'bus')::integer AS bus, (summarized ->> 'tram')::integer AS tram, (summarized ->> 'metro')::integer AS metro, 
-            (summarized ->> 'rail')::integer AS rail, (summarized ->> 'other')::integer AS other,
-            (summarized ->> 'bus')::integer + (summarized ->> 'tram')::integer + (summarized ->> 'metro')::integer +
-            (summarized ->> 'rail')::integer + (summarized ->> 'other')::integer AS total
+            SELECT CAST(:layer_id AS uuid), s.geom, s.stop_id, s.stop_name, s.trip_cnt,
+            summarized.bus, summarized.tram, summarized.metro, summarized.rail, summarized.other,
+            summarized.bus + summarized.tram + summarized.metro + summarized.rail + summarized.other AS total
             FROM basic.count_public_transport_services_station(
-                '{layer_project.table_name}',
+                :table_area,
                 :where_query,
-                '{str(timedelta(seconds=params.time_window.from_time))}',
-                '{str(timedelta(seconds=params.time_window.to_time))}',
+                '{params.time_window.from_time_interval}',
+                '{params.time_window.to_time_interval}',
                 {params.time_window.weekday_integer}
-            ) s, LATERAL basic.summarize_trip_count(trip_cnt, '{json.dumps(flat_mode_mapping)}'::JSONB) summarized
+            ) s, LATERAL basic.summarize_trip_count(trip_cnt, '{FLAT_MODE_MAPPING_JSON}'::JSONB) summarized
         """
         where_query = build_where_clause([layer_project.where_query])
-        await self.async_session.execute(sql_query, {"where_query": where_query})
+        await self.async_session.execute(
+            sql_query,
+            {
+                "layer_id": str(result_layer.id),
+                "table_area": layer_project.table_name,
+                "where_query": where_query,
+            },
+        )
         await self.async_session.commit()
 
         # Create result layer
@@ -326,8 +356,8 @@ class CRUDNearbyStationAccess(CRUDToolBase):
 
     def __init__(self, job_id, background_tasks, async_session, user_id, project_id):
         super().__init__(job_id, background_tasks, async_session, user_id, project_id)
-        self.result_table = (
-            f"{settings.USER_DATA_SCHEMA}.point_{str(self.user_id).replace('-', '')}"
+        self.result_table = get_user_data_table(
+            settings.USER_DATA_SCHEMA, UserDataGeomType.point.value, str(self.user_id)
         )
 
     @job_log(job_step_name="nearby_station_access")
@@ -4,7 +4,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 from src.utils import table_exists
-from src.schemas.layer import NumberColumnsPerType, UserDataTable
+from src.schemas.layer import NUMBER_COLUMNS_PER_TYPE, UserDataTable
 from src.core.config import settings
 
 
@@ -36,16 +36,16 @@ class CRUDUser(CRUDBase):
                     id SERIAL PRIMARY KEY,
                     layer_id UUID NOT NULL,
                     {geom_column}
-                    {', '.join([f'integer_attr{i+1} INTEGER' for i in range(NumberColumnsPerType.integer.value)])},
-                    {', '.join([f'bigint_attr{i+1} BIGINT' for i in range(NumberColumnsPerType.bigint.value)])},
-                    {', '.join([f'float_attr{i+1} FLOAT' for i in range(NumberColumnsPerType.float.value)])},
-                    {', '.join([f'text_attr{i+1} TEXT' for i in range(NumberColumnsPerType.text.value)])},
-                    {', '.join([f'jsonb_attr{i+1} jsonb' for i in range(NumberColumnsPerType.jsonb.value)])},
-                    {', '.join([f'arrint_attr{i+1} INTEGER[]' for i in range(NumberColumnsPerType.arrint.value)])},
-                    {', '.join([f'arrfloat_attr{i+1} FLOAT[]' for i in range(NumberColumnsPerType.arrfloat.value)])},
-                    {', '.join([f'arrtext_attr{i+1} TEXT[]' for i in range(NumberColumnsPerType.arrtext.value)])},
-                    {', '.join([f'timestamp_attr{i+1} TIMESTAMP' for i in range(NumberColumnsPerType.timestamp.value)])},
-                    {', '.join([f'boolean_attr{i+1} BOOLEAN' for i in range(NumberColumnsPerType.boolean.value)])},
+                    {', '.join([f'integer_attr{i+1} INTEGER' for i in range(NUMBER_COLUMNS_PER_TYPE['integer'])])},
+                    {', '.join([f'bigint_attr{i+1} BIGINT' for i in range(NUMBER_COLUMNS_PER_TYPE['bigint'])])},
+                    {', '.join([f'float_attr{i+1} FLOAT' for i in range(NUMBER_COLUMNS_PER_TYPE['float'])])},
+                    {', '.join([f'text_attr{i+1} TEXT' for i in range(NUMBER_COLUMNS_PER_TYPE['text'])])},
+                    {', '.join([f'jsonb_attr{i+1} jsonb' for i in range(NUMBER_COLUMNS_PER_TYPE['jsonb'])])},
+                    {', '.join([f'arrint_attr{i+1} INTEGER[]' for i in range(NUMBER_COLUMNS_PER_TYPE['arrint'])])},
+                    {', '.join([f'arrfloat_attr{i+1} FLOAT[]' for i in range(NUMBER_COLUMNS_PER_TYPE['arrfloat'])])},
+                    {', '.join([f'arrtext_attr{i+1} TEXT[]' for i in range(NUMBER_COLUMNS_PER_TYPE['arrtext'])])},
+                    {', '.join([f'timestamp_attr{i+1} TIMESTAMP' for i in range(NUMBER_COLUMNS_PER_TYPE['timestamp'])])},
+                    {', '.join([f'boolean_attr{i+1} BOOLEAN' for i in range(NUMBER_COLUMNS_PER_TYPE['boolean'])])},
                     updated_at timestamptz NOT NULL DEFAULT to_char((CURRENT_TIMESTAMP AT TIME ZONE 'UTC'::text), 'YYYY-MM-DD"T"HH24:MI:SSOF'::text)::timestamp with time zone,
 	                created_at timestamptz NOT NULL DEFAULT to_char((CURRENT_TIMESTAMP AT TIME ZONE 'UTC'::text), 'YYYY-MM-DD"T"HH24:MI:SSOF'::text)::timestamp with time zone
                     {additional_columns}
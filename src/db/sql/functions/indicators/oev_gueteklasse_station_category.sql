@@ -1,8 +1,9 @@
 DROP FUNCTION IF EXISTS basic.oev_guetklasse_station_category;
 CREATE OR REPLACE FUNCTION basic.oev_guetklasse_station_category(_station jsonb, _station_config jsonb, _start_time numeric, _end_time numeric)
- RETURNS jsonb
+ RETURNS TABLE(frequency float, _class integer)
  LANGUAGE plpgsql
 AS $function$
+#variable_conflict use_column
 DECLARE
     _station_groups text[] := '{}';
     _station_group_trip_count numeric := 0;
@@ -33,7 +34,8 @@ BEGIN
     END LOOP;
     
 	IF _station_group_trip_count = 0 THEN
-        RETURN JSONB_BUILD_OBJECT('_class', '999', 'frequency', 0);
+        RETURN QUERY SELECT 0::float, 999;
+        RETURN;
     END IF;
 
     _station_group := (SELECT min(_group) FROM unnest(_station_groups) _group); -- Get minimum (highest priority)
@@ -47,15 +49,16 @@ BEGIN
 	WHERE _station_group_trip_time_frequency <= _time;
 
     IF _time_interval IS NULL THEN
-        RETURN JSONB_BUILD_OBJECT('_class', '999', 'frequency', _station_group_trip_time_frequency);
+        RETURN QUERY SELECT _station_group_trip_time_frequency::float, 999;
+        RETURN;
     END IF;
 
     _station_category := _station_config->'categories'->_time_interval-2 ->>_station_group;
 
     IF _station_category IS NULL THEN
-        RETURN JSONB_BUILD_OBJECT('_class', '999', 'frequency', _station_group_trip_time_frequency);
+        RETURN QUERY SELECT _station_group_trip_time_frequency::float, 999;
     ELSE
-        RETURN JSONB_BUILD_OBJECT('_class', _station_category, 'frequency', _station_group_trip_time_frequency);
+        RETURN QUERY SELECT _station_group_trip_time_frequency::float, _station_category::integer;
     END IF;
 END;
 $function$;
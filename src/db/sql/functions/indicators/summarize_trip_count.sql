@@ -0,0 +1,19 @@
+DROP FUNCTION IF EXISTS basic.summarize_trip_count;
+CREATE OR REPLACE FUNCTION basic.summarize_trip_count(_trip_cnt jsonb, _mode_mapping jsonb)
+RETURNS TABLE(bus integer, tram integer, metro integer, rail integer, other integer)
+LANGUAGE sql
+IMMUTABLE
+AS $function$
+	-- Sum the trips of the route types per public transport mode
+	SELECT COALESCE(SUM(t.value::integer) FILTER (WHERE _mode_mapping ->> t.key = 'bus'), 0)::integer AS bus,
+	COALESCE(SUM(t.value::integer) FILTER (WHERE _mode_mapping ->> t.key = 'tram'), 0)::integer AS tram,
+	COALESCE(SUM(t.value::integer) FILTER (WHERE _mode_mapping ->> t.key = 'metro'), 0)::integer AS metro,
+	COALESCE(SUM(t.value::integer) FILTER (WHERE _mode_mapping ->> t.key = 'rail'), 0)::integer AS rail,
+	COALESCE(SUM(t.value::integer) FILTER (WHERE _mode_mapping ->> t.key = 'other'), 0)::integer AS other
+	FROM jsonb_each_text(_trip_cnt) t;
+$function$
+PARALLEL SAFE;
+/*
+SELECT *
+FROM basic.summarize_trip_count('{"3": 10, "0": 4}'::jsonb, '{"3": "bus", "0": "tram"}'::jsonb)
+*/
@@ -1,7 +1,7 @@
 from typing import Generator, Optional
 
 from fastapi import HTTPException, Request
-from httpx import AsyncClient, Timeout
+from httpx import AsyncClient, Limits, Timeout
 from jose import jwt
 
 from src.core.config import settings
@@ -43,10 +43,16 @@ def get_http_client():
     global http_client
     if http_client is None:
         http_client = AsyncClient(
+            http2=True,
+            limits=Limits(
+                max_connections=settings.ASYNC_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ASYNC_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.ASYNC_CLIENT_KEEPALIVE_EXPIRY,
+            ),
             timeout=Timeout(
                 settings.ASYNC_CLIENT_DEFAULT_TIMEOUT,
                 read=settings.ASYNC_CLIENT_READ_TIMEOUT,
-            )
+            ),
         )
     return http_client
 
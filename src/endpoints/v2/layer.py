@@ -55,7 +55,7 @@ from src.schemas.layer import (
     ILayerExternalCreate,
     ILayerRead,
     IUniqueValue,
-    MaxFileSizeType,
+    MAX_FILE_SIZE,
 )
 from src.schemas.layer import request_examples as layer_request_examples
 from src.utils import build_where, check_file_size
@@ -92,12 +92,12 @@ async def file_upload(
         )
 
     if (
-        await check_file_size(file=file, max_size=MaxFileSizeType[file_ending].value)
+        await check_file_size(file=file, max_size=MAX_FILE_SIZE[file_ending])
         is False
     ):
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size too large. Max file size is {round(MaxFileSizeType[file_ending].value / 1048576, 2)} MB",
+            detail=f"File size too large. Max file size is {round(MAX_FILE_SIZE[file_ending] / 1048576, 2)} MB",
         )
 
     # Run the validation
@@ -430,6 +430,55 @@ def generate_jsolines(grid, travel_time, percentile, steps):
     return isochrones
 
 
+def generate_jsolines_from_r5_bytes(result, travel_time, percentile, steps):
+    """
+    Generate the jsolines directly from the raw R5 grid response.
+
+    Only the surface of the requested percentile is read and accumulated, the
+    other percentiles and the metadata of the response are never decoded.
+
+    :return: A GeoDataFrame with the jsolines.
+
+    """
+    HEADER_ENTRIES = 7
+    HEADER_LENGTH = 9  # type + entries
+    TIMES_GRID_TYPE = b"ACCESSGR"
+
+    # Parse header
+    if bytes(result[:8]) != TIMES_GRID_TYPE:
+        raise ValueError("Invalid grid type")
+    version, zoom, west, north, width, height, depth = np.frombuffer(
+        result, count=HEADER_ENTRIES, offset=8, dtype="<i4"
+    )
+    if version != 0:
+        raise ValueError("Invalid grid version")
+
+    # View the payload without copying and select the percentile surface
+    travel_time_percentiles = [5, 25, 50, 75, 95]
+    percentile_index = (
+        0 if depth == 1 else travel_time_percentiles.index(percentile)
+    )
+    data = np.frombuffer(
+        result,
+        offset=HEADER_LENGTH * 4,
+        count=width * height * depth,
+        dtype="<i4",
+    ).reshape(depth, width * height)
+    surface = data[percentile_index].cumsum().astype(np.uint16)
+
+    isochrones = jsolines(
+        surface,
+        width,
+        height,
+        west,
+        north,
+        zoom,
+        cutoffs=np.arange(start=0, stop=travel_time + 1, step=(travel_time / steps)),
+        return_incremental=True,
+    )
+    return isochrones
+
+
 if __name__ == "__main__":
     fileName = "/app/src/tests/data/isochrone/public_transport_calculation.bin"
     with open(fileName, mode="rb") as file:  # b is important -> binary
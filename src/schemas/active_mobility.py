@@ -46,9 +46,9 @@ class TravelTimeCostActiveMobility(BaseModel):
     )
 
     # Ensure the number of steps doesn't exceed the maximum traveltime
-    @validator("steps", pre=True, always=True)
-    def valid_num_steps(cls, v):
-        if v > 45:
+    @validator("steps")
+    def valid_num_steps(cls, v, values):
+        if "max_traveltime" in values and v > values["max_traveltime"]:
             raise ValueError(
                 "The number of steps must not exceed the maximum traveltime."
             )
@@ -73,9 +73,9 @@ class TravelDistanceCostActiveMobility(BaseModel):
     )
 
     # Ensure the number of steps doesn't exceed the maximum distance
-    @validator("steps", pre=True, always=True)
-    def valid_num_steps(cls, v):
-        if v > 20000:
+    @validator("steps")
+    def valid_num_steps(cls, v, values):
+        if "max_distance" in values and v > values["max_distance"]:
             raise ValueError(
                 "The number of steps must not exceed the maximum distance."
             )
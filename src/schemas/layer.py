@@ -1,10 +1,12 @@
 # Standard library imports
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List
 from uuid import UUID, uuid4
 
 # Third party imports
-from pydantic import BaseModel, Field, HttpUrl, ValidationError, validator
+from pydantic import BaseModel, Field, HttpUrl, validator
 from pyproj import CRS
 from pyproj.exceptions import CRSError
 
@@ -26,27 +28,33 @@ from src.db.models.layer import (
 )
 from src.schemas.common import CQLQuery
 from src.schemas.job import Msg
-from src.utils import optional
-
-
-class MaxFileSizeType(int, Enum):
-    """Max file size types in bytes."""
-
-    geojson = 300000000
-    csv = 100000000
-    xlsx = 100000000
-    gpkg = 300000000
-    kml = 300000000
-    zip = 300000000
+from src.utils import freeze, optional
+
+
+# Max file size per file type in bytes
+MAX_FILE_SIZE = MappingProxyType(
+    {
+        "geojson": 300000000,
+        "csv": 100000000,
+        "xlsx": 100000000,
+        "gpkg": 300000000,
+        "kml": 300000000,
+        "zip": 300000000,
+    }
+)
 
 
-class SupportedOgrGeomType(Enum):
-    Point = "point"
-    Multi_Point = "point"
-    Line_String = "line"
-    Multi_Line_String = "line"
-    Polygon = "polygon"
-    Multi_Polygon = "polygon"
+# User data geometry type of the supported OGR geometry types
+OGR_GEOM_TO_INTERNAL = MappingProxyType(
+    {
+        "Point": "point",
+        "Multi_Point": "point",
+        "Line_String": "line",
+        "Multi_Line_String": "line",
+        "Polygon": "polygon",
+        "Multi_Polygon": "polygon",
+    }
+)
 
 
 class UserDataGeomType(Enum):
@@ -78,19 +86,21 @@ class OgrDriverType(str, Enum):
     zip = "ESRI Shapefile"  # Using SHP driver for ZIP files as the file is converted to SHP to keep data types
 
 
-class NumberColumnsPerType(int, Enum):
-    """Number of columns per type."""
-
-    integer = 25
-    bigint = 5
-    float = 25
-    text = 25
-    timestamp = 3
-    arrfloat = 3
-    arrint = 3
-    arrtext = 3
-    jsonb = 10
-    boolean = 10
+# Number of columns per type in the user data tables
+NUMBER_COLUMNS_PER_TYPE = MappingProxyType(
+    {
+        "integer": 25,
+        "bigint": 5,
+        "float": 25,
+        "text": 25,
+        "timestamp": 3,
+        "arrfloat": 3,
+        "arrint": 3,
+        "arrtext": 3,
+        "jsonb": 10,
+        "boolean": 10,
+    }
+)
 
 
 class IFileUploadMetadata(BaseModel):
@@ -168,18 +178,20 @@ class FeatureUpdateBase(LayerBase, GeospatialAttributes):
     properties: dict | None = Field(None, description="Layer properties.")
 
 
-feature_layer_update_base_example = {
-    "properties": [
-        "match",
-        ["get", "category"],
-        ["forest"],
-        "hsl(137, 37%, 30%)",
-        ["park"],
-        "hsl(135, 100%, 100%)",
-        "#000000",
-    ],
-    "size": 1000,
-}
+feature_layer_update_base_example = freeze(
+    {
+        "properties": [
+            "match",
+            ["get", "category"],
+            ["forest"],
+            "hsl(137, 37%, 30%)",
+            ["park"],
+            "hsl(135, 100%, 100%)",
+            "#000000",
+        ],
+        "size": 1000,
+    }
+)
 
 
 # Feature Layer Standard
@@ -235,9 +247,11 @@ class FeatureToolAttributesBase(BaseModel):
     tool_type: ToolType = Field(..., description="Tool type")
 
 
-feature_layer_tool_attributes_example = {
-    "tool_type": "isochrone",
-}
+feature_layer_tool_attributes_example = freeze(
+    {
+        "tool_type": "isochrone",
+    }
+)
 
 
 class IFeatureToolCreate(LayerBase, FeatureToolAttributesBase):
@@ -269,10 +283,12 @@ class FeatureScenarioAttributesBase(BaseModel):
     scenario_type: ScenarioType = Field(..., description="Scenario type")
 
 
-feature_layer_scenario_attributes_example = {
-    "scenario_id": "60a42459-11c8-4cd7-91f1-091d0e05a4a3",
-    "scenario_type": "point",
-}
+feature_layer_scenario_attributes_example = freeze(
+    {
+        "scenario_id": "60a42459-11c8-4cd7-91f1-091d0e05a4a3",
+        "scenario_type": "point",
+    }
+)
 
 
 class IFeatureScenarioCreate(LayerBase, FeatureScenarioAttributesBase):
@@ -311,6 +327,13 @@ class LayerOtherProperties(BaseModel):
     legend_urls: List[HttpUrl] | None = Field(None, description="Layer legend URLs")
 
 
+class LayerOtherPropertiesRead(LayerOtherProperties):
+    """Model to read external imagery layer properties."""
+
+    # URLs are validated on write and not parsed again when reading
+    legend_urls: List[str] | None = Field(None, description="Layer legend URLs")
+
+
 class ExternalImageryAttributesBase(BaseModel):
     """Base model for additional attributes imagery layer."""
 
@@ -322,24 +345,26 @@ class ExternalImageryAttributesBase(BaseModel):
     )
 
 
-imagery_layer_attributes_example = {
-    "url": "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetCapabilities&service=WMS",
-    "data_type": "wms",
-    "properties": {
-        "type": "raster",
-        "paint": {"raster-opacity": 1},
-    },
-    "other_properties": {
-        "layers": ["Actueel_ortho25"],
-        "width": 256,
-        "height": 256,
-        "srs": "EPSG:3857",
-        "legend_urls": [
-            "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
-            "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
-        ],
-    },
-}
+imagery_layer_attributes_example = freeze(
+    {
+        "url": "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetCapabilities&service=WMS",
+        "data_type": "wms",
+        "properties": {
+            "type": "raster",
+            "paint": {"raster-opacity": 1},
+        },
+        "other_properties": {
+            "layers": ["Actueel_ortho25"],
+            "width": 256,
+            "height": 256,
+            "srs": "EPSG:3857",
+            "legend_urls": [
+                "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
+                "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
+            ],
+        },
+    }
+)
 
 
 class IExternalImageryCreate(
@@ -359,7 +384,10 @@ class IExternalImageryRead(
 ):
     """Model to read a imagery layer."""
 
-    pass
+    url: str = Field(..., description="Layer URL")
+    other_properties: LayerOtherPropertiesRead = Field(
+        ..., description="Additional layer properties."
+    )
 
 
 @optional
@@ -373,21 +401,23 @@ class IExternalImageryUpdate(LayerBase, GeospatialAttributes):
     )
 
 
-imagery_layer_update_base_example = {
-    "url": "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetCapabilities&service=WMS",
-    "properties": {
-        "type": "raster",
-        "paint": {"raster-opacity": 0.5},
-        "layers": ["Actueel_ortho25"],
-        "width": 256,
-        "height": 256,
-        "srs": "EPSG:3857",
-        "legend_urls": [
-            "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
-            "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
-        ],
-    },
-}
+imagery_layer_update_base_example = freeze(
+    {
+        "url": "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetCapabilities&service=WMS",
+        "properties": {
+            "type": "raster",
+            "paint": {"raster-opacity": 0.5},
+            "layers": ["Actueel_ortho25"],
+            "width": 256,
+            "height": 256,
+            "srs": "EPSG:3857",
+            "legend_urls": [
+                "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
+                "https://geodata.nationaalgeoregister.nl/luchtfoto/rgb/wms?request=GetLegendGraphic&service=WMS&layer=Actueel_ortho25&format=image/png&width=20&height=20",
+            ],
+        },
+    }
+)
 
 ################################################################################
 # VectorTile Layer DTOs
@@ -402,14 +432,16 @@ class ExternalVectorTileAttributesBase(BaseModel):
     properties: dict | None = Field(None, description="Layer properties.")
 
 
-tile_layer_attributes_example = {
-    "url": "https://goat.plan4better.de/api/v1/layers/tiles/accidents_pedestrians/12/2179/1420.pbf",
-    "data_type": "mvt",
-    "properties": {
-        "type": "fill",
-        "paint": {"fill-color": "#00ffff"},
-    },
-}
+tile_layer_attributes_example = freeze(
+    {
+        "url": "https://goat.plan4better.de/api/v1/layers/tiles/accidents_pedestrians/12/2179/1420.pbf",
+        "data_type": "mvt",
+        "properties": {
+            "type": "fill",
+            "paint": {"fill-color": "#00ffff"},
+        },
+    }
+)
 
 
 class IExternalVectorTileCreate(
@@ -429,7 +461,7 @@ class IExternalVectorTileRead(
 ):
     """Model to read a tile layer."""
 
-    pass
+    url: str = Field(..., description="Layer URL")
 
 
 @optional
@@ -439,13 +471,15 @@ class IExternalVectorTileUpdate(LayerBase, GeospatialAttributes):
     url: HttpUrl | None = Field(None, description="Layer URL")
 
 
-tile_layer_update_example = {
-    "url": "https://goat.plan4better.de/api/v1/layers/tiles/accidents_pedestrians/12/2179/1420.pbf",
-    "properties": {
-        "type": "fill",
-        "paint": {"fill-color": "#ff0000"},
-    },
-}
+tile_layer_update_example = freeze(
+    {
+        "url": "https://goat.plan4better.de/api/v1/layers/tiles/accidents_pedestrians/12/2179/1420.pbf",
+        "properties": {
+            "type": "fill",
+            "paint": {"fill-color": "#ff0000"},
+        },
+    }
+)
 
 ################################################################################
 # Table Layer DTOs
@@ -474,31 +508,34 @@ class ITableUpdate(LayerBase):
 
 
 def get_layer_class(class_type: str, layer_creator_class: dict, **kwargs):
-    try:
-        layer_type = kwargs["type"]
-    except KeyError:
-        raise ValidationError("Layer type is required")
+    layer_type = kwargs.get("type")
+    if layer_type is None:
+        raise ValueError("Layer type is required")
+    if layer_type not in layer_creator_class:
+        raise ValueError(f"Layer type ({layer_type}) is invalid")
 
     layer_class = layer_creator_class[layer_type]
     if layer_type == "feature":
-        try:
-            feature_layer_type = kwargs["feature_layer_type"]
-        except KeyError:
-            raise ValidationError("Feature layer type is required")
+        feature_layer_type = kwargs.get("feature_layer_type")
+        if feature_layer_type is None:
+            raise ValueError("Feature layer type is required")
+        if feature_layer_type not in layer_class:
+            raise ValueError(f"Feature layer type ({feature_layer_type}) is invalid")
 
         layer_class = layer_class[feature_layer_type]
 
-    layer_class_name = layer_class.__name__
-    if class_type == "create":
-        layer_class_name = layer_class_name.replace("Read", "Create")
-    elif class_type == "update":
-        layer_class_name = layer_class_name.replace("Read", "Update")
-    elif class_type == "read":
-        pass
-    else:
-        raise ValueError(f"Layer class type ({class_type}) is invalid")
+    return resolve_layer_class(class_type, layer_class)
 
-    return globals()[layer_class_name]
+
+def resolve_layer_class(class_type: str, layer_read_class: type) -> type:
+    """Get the layer class of the class type for a layer read class."""
+
+    if class_type == "read":
+        return layer_read_class
+    try:
+        return layer_class_table[(class_type, layer_read_class)]
+    except KeyError:
+        raise ValueError(f"Layer class type ({class_type}) is invalid")
 
 
 layer_creator_class = {
@@ -517,6 +554,21 @@ layer_creator_class = {
 }
 
 
+# Create and update classes of the layer read classes
+layer_class_table = {
+    ("create", IFeatureToolRead): IFeatureToolCreate,
+    ("create", IFeatureScenarioRead): IFeatureScenarioCreate,
+    ("create", IExternalImageryRead): IExternalImageryCreate,
+    ("create", IExternalVectorTileRead): IExternalVectorTileCreate,
+    ("update", ITableRead): ITableUpdate,
+    ("update", IFeatureStandardRead): IFeatureStandardUpdate,
+    ("update", IFeatureToolRead): IFeatureToolUpdate,
+    ("update", IFeatureScenarioRead): IFeatureScenarioUpdate,
+    ("update", IExternalImageryRead): IExternalImageryUpdate,
+    ("update", IExternalVectorTileRead): IExternalVectorTileUpdate,
+}
+
+
 layer_update_class = {
     "internal": {
         "table": ITableUpdate,
@@ -533,6 +585,13 @@ layer_update_class = {
 }
 
 
+# Internal and external layer classes merged for the dispatch
+layer_read_class = {
+    **layer_creator_class["internal"],
+    **layer_creator_class["external"],
+}
+
+
 # Write function to get the correct class
 def get_layer_schema(
     class_mapping: dict, layer_type: LayerType, feature_layer_type: FeatureType = None
@@ -561,22 +620,14 @@ class ILayerExternalCreate(BaseModel):
 
 class ILayerRead(BaseModel):
     def __new__(cls, *args, **kwargs):
-        layer_read_class = get_layer_class(
-            "read",
-            {**layer_creator_class["internal"], **layer_creator_class["external"]},
-            **kwargs,
-        )
-        return layer_read_class(**kwargs)
+        layer_class = get_layer_class("read", layer_read_class, **kwargs)
+        return layer_class(**kwargs)
 
 
 class ILayerUpdate(BaseModel):
     def __new__(cls, *args, **kwargs):
-        layer_update_class = get_layer_class(
-            "update",
-            {**layer_creator_class["internal"], **layer_creator_class["external"]},
-            **kwargs,
-        )
-        return layer_update_class(**kwargs)
+        layer_class = get_layer_class("update", layer_read_class, **kwargs)
+        return layer_class(**kwargs)
 
 
 class IUniqueValue(BaseModel):
@@ -592,6 +643,12 @@ class IValidateJobId(BaseModel):
     validate_job_id: UUID = Field(..., description="Upload job ID")
 
 
+@lru_cache(maxsize=128)
+def validate_crs_string(crs: str) -> None:
+    """Validate a CRS string by parsing it with PROJ."""
+    CRS(crs)
+
+
 class IInternalLayerExport(CQLQuery):
     """Layer export input schema."""
 
@@ -606,99 +663,96 @@ class IInternalLayerExport(CQLQuery):
         None, description="CRS of the exported file.", max_length=20
     )
 
-    # Check if crs is valid
+    # Check if crs is valid and that projection is EPSG:4326 for KML
     @validator("crs")
-    def validate_crs(cls, crs):
-        # Validate the provided CRS
+    def validate_crs(cls, crs, values):
+        if crs is None:
+            return crs
         try:
-            CRS(crs)
+            validate_crs_string(crs)
         except CRSError as e:
-            raise ValidationError(f"Invalid CRS: {e}")
-        return crs
-
-    # Check that projection is EPSG:4326 for KML
-    @validator("crs")
-    def validate_crs_kml(cls, crs, values):
-        if values["file_type"] == FeatureLayerExportType.kml:
-            if crs != "EPSG:4326":
-                raise ValidationError("KML export only supports EPSG:4326 projection.")
+            raise ValueError(f"Invalid CRS: {e}")
+        if values.get("file_type") == FeatureLayerExportType.kml and crs != "EPSG:4326":
+            raise ValueError("KML export only supports EPSG:4326 projection.")
         return crs
 
 
-request_examples = {
-    "get": {
-        "ids": [
-            "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
-            "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
-        ],
-    },
-    "create_internal": {
-        "table": {
-            "summary": "Table Layer",
-            "value": {
-                "dataset_id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
-                **content_base_example,
-                **layer_base_example,
-            },
+request_examples = freeze(
+    {
+        "get": {
+            "ids": [
+                "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
+                "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
+            ],
         },
-        "feature_layer_standard": {
-            "summary": "Layer Standard",
-            "value": {
-                "dataset_id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
-                **content_base_example,
-                **layer_base_example,
+        "create_internal": {
+            "table": {
+                "summary": "Table Layer",
+                "value": {
+                    "dataset_id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
+                    **content_base_example,
+                    **layer_base_example,
+                },
             },
-        },
-    },
-    "export_internal": {
-        "table": {
-            "summary": "Table Layer",
-            "value": {
-                "id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
-                "file_type": "csv",
-                "file_name": "test",
-                "crs": "EPSG:3857",
-                "query": {"op": "=", "args": [{"property": "category"}, "bus_stop"]},
+            "feature_layer_standard": {
+                "summary": "Layer Standard",
+                "value": {
+                    "dataset_id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
+                    **content_base_example,
+                    **layer_base_example,
+                },
             },
         },
-        "feature_layer_standard": {
-            "summary": "Layer Standard",
-            "value": {
-                "id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
-                "file_type": "csv",
-                "file_name": "test",
+        "export_internal": {
+            "table": {
+                "summary": "Table Layer",
+                "value": {
+                    "id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
+                    "file_type": "csv",
+                    "file_name": "test",
+                    "crs": "EPSG:3857",
+                    "query": {"op": "=", "args": [{"property": "category"}, "bus_stop"]},
+                },
             },
-        },
-    },
-    "create_external": {
-        "external_imagery": {
-            "summary": "Imagery Layer",
-            "value": {
-                **content_base_example,
-                **layer_base_example,
-                **imagery_layer_attributes_example,
-                "type": "external_imagery",
-                "extent": "MULTIPOLYGON(((0 0, 0 1, 1 1, 1 0, 0 0)), ((2 2, 2 3, 3 3, 3 2, 2 2)))",
+            "feature_layer_standard": {
+                "summary": "Layer Standard",
+                "value": {
+                    "id": "699b6116-a8fb-457c-9954-7c9efc9f83ee",
+                    "file_type": "csv",
+                    "file_name": "test",
+                },
             },
         },
-        "external_vector_tile": {
-            "summary": "VectorTile Layer",
-            "value": {
-                **content_base_example,
-                **layer_base_example,
-                **tile_layer_attributes_example,
-                "type": "external_vector_tile",
-                "extent": "MULTIPOLYGON(((0 0, 0 1, 1 1, 1 0, 0 0)), ((2 2, 2 3, 3 3, 3 2, 2 2)))",
+        "create_external": {
+            "external_imagery": {
+                "summary": "Imagery Layer",
+                "value": {
+                    **content_base_example,
+                    **layer_base_example,
+                    **imagery_layer_attributes_example,
+                    "type": "external_imagery",
+                    "extent": "MULTIPOLYGON(((0 0, 0 1, 1 1, 1 0, 0 0)), ((2 2, 2 3, 3 3, 3 2, 2 2)))",
+                },
+            },
+            "external_vector_tile": {
+                "summary": "VectorTile Layer",
+                "value": {
+                    **content_base_example,
+                    **layer_base_example,
+                    **tile_layer_attributes_example,
+                    "type": "external_vector_tile",
+                    "extent": "MULTIPOLYGON(((0 0, 0 1, 1 1, 1 0, 0 0)), ((2 2, 2 3, 3 3, 3 2, 2 2)))",
+                },
             },
         },
-    },
-    "update": {
-        "table": {
-            "summary": "Table Layer",
-            "value": {
-                **content_base_example,
-                **layer_base_example,
+        "update": {
+            "table": {
+                "summary": "Table Layer",
+                "value": {
+                    **content_base_example,
+                    **layer_base_example,
+                },
             },
         },
-    },
-}
+    }
+)
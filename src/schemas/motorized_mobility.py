@@ -1,3 +1,4 @@
+from datetime import timedelta
 from enum import Enum
 from typing import List, Optional
 
@@ -127,6 +128,14 @@ class PTTimeWindow(BaseModel):
         }
         return mapping[PTSupportedDay(self.weekday).value]
 
+    @property
+    def from_time_interval(self):
+        return str(timedelta(seconds=self.from_time))
+
+    @property
+    def to_time_interval(self):
+        return str(timedelta(seconds=self.to_time))
+
     @property
     def weekday_date(self):
         mapping = {
@@ -14,9 +14,10 @@ from src.schemas.layer import (
     IFeatureToolRead,
     ITableRead,
     LayerOtherProperties,
+    LayerOtherPropertiesRead,
 )
 from src.schemas.common import CQLQuery
-from src.utils import build_where, optional
+from src.utils import build_where, freeze, optional
 
 
 ################################################################################
@@ -36,6 +37,7 @@ class InitialViewState(BaseModel):
     bearing: int = Field(..., description="Bearing", ge=0, le=360)
     pitch: int = Field(..., description="Pitch", ge=0, le=60)
 
+    # Fields are validated in order, so min_zoom is already in values here
     @validator("max_zoom")
     def check_max_zoom(cls, max_zoom, values):
         min_zoom = values.get("min_zoom")
@@ -43,23 +45,18 @@ class InitialViewState(BaseModel):
             raise ValueError("max_zoom should be greater than or equal to min_zoom")
         return max_zoom
 
-    @validator("min_zoom")
-    def check_min_zoom(cls, min_zoom, values):
-        max_zoom = values.get("max_zoom")
-        if max_zoom is not None and min_zoom > max_zoom:
-            raise ValueError("min_zoom should be less than or equal to max_zoom")
-        return min_zoom
-
-
-initial_view_state_example = {
-    "latitude": 48.1502132,
-    "longitude": 11.5696284,
-    "zoom": 12,
-    "min_zoom": 0,
-    "max_zoom": 20,
-    "bearing": 0,
-    "pitch": 0,
-}
+
+initial_view_state_example = freeze(
+    {
+        "latitude": 48.1502132,
+        "longitude": 11.5696284,
+        "zoom": 12,
+        "min_zoom": 0,
+        "max_zoom": 20,
+        "bearing": 0,
+        "pitch": 0,
+    }
+)
 
 
 class IProjectCreate(ContentBaseAttributes):
@@ -101,7 +98,9 @@ class IFeatureBaseProject(CQLQuery):
     )
 
 
-class IFeatureBaseProjectRead(IFeatureBaseProject):
+class InternalLayerProjectReadBase(BaseModel):
+    """Shared attributes of internal layers read from a project."""
+
     total_count: int | None = Field(
         None, description="Total count of features in the layer"
     )
@@ -109,6 +108,7 @@ class IFeatureBaseProjectRead(IFeatureBaseProject):
         None, description="Filtered count of features in the layer"
     )
 
+    # Compute table_name and where_query
     @property
     def table_name(self):
         return internal_layer_table_name(self)
@@ -118,9 +118,17 @@ class IFeatureBaseProjectRead(IFeatureBaseProject):
         return where_query(self)
 
 
+class IFeatureBaseProjectRead(IFeatureBaseProject, InternalLayerProjectReadBase):
+    pass
+
+
 def where_query(values: SQLModel | BaseModel):
-    table_name = internal_layer_table_name(values)
-    # Check if query exists then build where query
+    table_name = values.table_name
+    # Without a query only filter by layer id and skip parsing the CQL
+    if not values.query:
+        return build_where(
+            id=values.layer_id, table_name=table_name, query=None, attribute_mapping={}
+        )
     return build_where(
         id=values.layer_id,
         table_name=table_name,
@@ -161,25 +169,10 @@ class IFeatureScenarioProjectUpdate(IFeatureBaseProject):
     pass
 
 
-class ITableProjectRead(LayerProjectIds, ITableRead, CQLQuery):
+class ITableProjectRead(
+    LayerProjectIds, ITableRead, CQLQuery, InternalLayerProjectReadBase
+):
     group: str = Field(None, description="Layer group name", max_length=255)
-    total_count: int | None = Field(
-        None, description="Total count of features in the layer"
-    )
-    filtered_count: int | None = Field(
-        None, description="Filtered count of features in the layer"
-    )
-    table_name: str | None = Field(None, description="Table name")
-    where_query: str | None = Field(None, description="Where query")
-
-    # Compute table_name and where_query
-    @property
-    def table_name(self):
-        return internal_layer_table_name(self)
-
-    @property
-    def where_query(self):
-        return where_query(self)
 
 
 @optional
@@ -212,7 +205,7 @@ class IExternalImageryProjectRead(LayerProjectIds, IExternalImageryRead):
         ...,
         description="Layer properties",
     )
-    other_properties: LayerOtherProperties = Field(
+    other_properties: LayerOtherPropertiesRead = Field(
         ...,
         description="Other properties of the layer",
     )
@@ -250,102 +243,107 @@ layer_type_mapping_update = {
     "external_imagery": IExternalImageryProjectUpdate,
 }
 
-request_examples = {
-    "get": {
-        "ids": [
-            "39e16c27-2b03-498e-8ccc-68e798c64b8d",
-            "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
-        ],
-    },
-    "create": {
-        "folder_id": "39e16c27-2b03-498e-8ccc-68e798c64b8d",
-        "name": "Project 1",
-        "description": "Project 1 description",
-        "tags": ["tag1", "tag2"],
-        "thumbnail_url": "https://goat-app-assets.s3.eu-central-1.amazonaws.com/logos/goat_green.png",
+request_examples = freeze(
+    {
+        "get": {
+            "ids": [
+                "39e16c27-2b03-498e-8ccc-68e798c64b8d",
+                "e7dcaae4-1750-49b7-89a5-9510bf2761ad",
+            ],
+        },
+        "create": {
+            "folder_id": "39e16c27-2b03-498e-8ccc-68e798c64b8d",
+            "name": "Project 1",
+            "description": "Project 1 description",
+            "tags": ["tag1", "tag2"],
+            "thumbnail_url": "https://goat-app-assets.s3.eu-central-1.amazonaws.com/logos/goat_green.png",
+            "initial_view_state": initial_view_state_example,
+        },
+        "update": {
+            "folder_id": "39e16c27-2b03-498e-8ccc-68e798c64b8d",
+            "name": "Project 2",
+            "description": "Project 2 description",
+            "tags": ["tag1", "tag2"],
+            "thumbnail_url": "https://goat-app-assets.s3.eu-central-1.amazonaws.com/logos/goat_green.png",
+        },
         "initial_view_state": initial_view_state_example,
-    },
-    "update": {
-        "folder_id": "39e16c27-2b03-498e-8ccc-68e798c64b8d",
-        "name": "Project 2",
-        "description": "Project 2 description",
-        "tags": ["tag1", "tag2"],
-        "thumbnail_url": "https://goat-app-assets.s3.eu-central-1.amazonaws.com/logos/goat_green.png",
-    },
-    "initial_view_state": initial_view_state_example,
-    "update_layer": {
-        "feature_standard": {
-            "summary": "Feature Layer Standard",
-            "value": {
-                "name": "Feature Layer Standard",
-                "group": "Group 1",
-                "query": {"op": "=", "args": [{"property": "category"}, "bus_stop"]},
-                "properties": {
-                    "type": "circle",
-                    "paint": {
-                        "circle-radius": 5,
-                        "circle-color": "#ff0000",
+        "update_layer": {
+            "feature_standard": {
+                "summary": "Feature Layer Standard",
+                "value": {
+                    "name": "Feature Layer Standard",
+                    "group": "Group 1",
+                    "query": {
+                        "op": "=",
+                        "args": [{"property": "category"}, "bus_stop"],
+                    },
+                    "properties": {
+                        "type": "circle",
+                        "paint": {
+                            "circle-radius": 5,
+                            "circle-color": "#ff0000",
+                        },
+                        "layout": {"visibility": "visible"},
+                        "minzoom": 0,
+                        "maxzoom": 22,
                     },
-                    "layout": {"visibility": "visible"},
-                    "minzoom": 0,
-                    "maxzoom": 22,
                 },
             },
-        },
-        "feature_tool": {
-            "summary": "Feature Layer Tool",
-            "value": {
-                "name": "Feature Layer Tool",
-                "group": "Group 1",
-                "properties": {
-                    "type": "circle",
-                    "paint": {
-                        "circle-radius": 5,
-                        "circle-color": "#ff0000",
+            "feature_tool": {
+                "summary": "Feature Layer Tool",
+                "value": {
+                    "name": "Feature Layer Tool",
+                    "group": "Group 1",
+                    "properties": {
+                        "type": "circle",
+                        "paint": {
+                            "circle-radius": 5,
+                            "circle-color": "#ff0000",
+                        },
+                        "layout": {"visibility": "visible"},
+                        "minzoom": 0,
+                        "maxzoom": 22,
                     },
-                    "layout": {"visibility": "visible"},
-                    "minzoom": 0,
-                    "maxzoom": 22,
                 },
             },
-        },
-        "feature_scenario": {
-            "summary": "Feature Layer Scenario",
-            "value": {
-                "name": "Feature Layer Scenario",
-                "group": "Group 1",
-                "properties": {
-                    "type": "circle",
-                    "paint": {
-                        "circle-radius": 5,
-                        "circle-color": "#ff0000",
+            "feature_scenario": {
+                "summary": "Feature Layer Scenario",
+                "value": {
+                    "name": "Feature Layer Scenario",
+                    "group": "Group 1",
+                    "properties": {
+                        "type": "circle",
+                        "paint": {
+                            "circle-radius": 5,
+                            "circle-color": "#ff0000",
+                        },
+                        "layout": {"visibility": "visible"},
+                        "minzoom": 0,
+                        "maxzoom": 22,
                     },
-                    "layout": {"visibility": "visible"},
-                    "minzoom": 0,
-                    "maxzoom": 22,
                 },
             },
-        },
-        "table": {
-            "summary": "Table Layer",
-            "value": {
-                "name": "Table Layer",
-                "group": "Group 1",
+            "table": {
+                "summary": "Table Layer",
+                "value": {
+                    "name": "Table Layer",
+                    "group": "Group 1",
+                },
             },
-        },
-        "external_vector_tile": {
-            "summary": "VectorVectorTile Layer",
-            "value": {
-                "name": "VectorVectorTile Layer",
-                "group": "Group 1",
+            "external_vector_tile": {
+                "summary": "VectorVectorTile Layer",
+                "value": {
+                    "name": "VectorVectorTile Layer",
+                    "group": "Group 1",
+                },
             },
-        },
-        "external_imagery": {
-            "summary": "Imagery Layer",
-            "value": {
-                "name": "Imagery Layer",
-                "group": "Group 1",
+            "external_imagery": {
+                "summary": "Imagery Layer",
+                "value": {
+                    "name": "Imagery Layer",
+                    "group": "Group 1",
+                },
             },
         },
-    },
-}
+    }
+)
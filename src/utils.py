@@ -11,7 +11,8 @@ import string
 import subprocess
 import time
 import zipfile
-from functools import wraps
+from functools import lru_cache, wraps
+from types import MappingProxyType
 from typing import Any
 from uuid import UUID
 
@@ -47,6 +48,17 @@ def optional(*fields):
     return dec
 
 
+def freeze(data: dict) -> MappingProxyType:
+    """Wrap a dict and its nested dicts into read-only mappings."""
+
+    return MappingProxyType(
+        {
+            key: freeze(value) if isinstance(value, dict) else value
+            for key, value in data.items()
+        }
+    )
+
+
 async def table_exists(db: AsyncSession, schema_name: str, table_name: str) -> bool:
     sql_check_table = (
         select(func.count())
@@ -439,31 +451,49 @@ def get_result_column(
         return {mapped_column: base_column_name}
 
 
+@lru_cache(maxsize=10000)
+def get_user_data_table(schema: str, geom_type: str, user_id: str) -> str:
+    """Get the user data table of the given geometry type."""
+    return f"{schema}.{geom_type}_{UUID(user_id).hex}"
+
+
 def build_where(id: UUID, table_name: str, query: str | dict, attribute_mapping: dict):
     if query is None:
         return f"{table_name}.layer_id = '{str(id)}'"
     else:
-        if isinstance(query, str):
-            query = json.loads(query)
-        query_obj = CQLQuery(query=query)
-        ast = cql2_json_parser(query_obj.query)
-        attribute_mapping = {value: key for key, value in attribute_mapping.items()}
-        # Add id to attribute mapping
-        attribute_mapping["id"] = "id"
-        attribute_mapping["geometry"] = "geom"
-        attribute_mapping["geom"] = "geom"
-        where = f"{table_name}.layer_id = '{str(id)}' AND "
-        converted_cql = re.sub(
-            r'(?<=\(|\s|,)"', f'{table_name}."', to_sql_where(ast, attribute_mapping)
+        # Use hashable keys so the same filter on a layer is only converted once
+        if not isinstance(query, str):
+            query = json.dumps(query, sort_keys=True)
+        return _build_cql_where(
+            str(id), table_name, query, tuple(sorted(attribute_mapping.items()))
         )
-        # Fixing issue with pygeofilter https://github.com/geopython/pygeofilter/pull/54
-        converted_cql = converted_cql.replace("x'", "E'\\\\x")
-        # Add SRID to ST_GeomFromWKB otherwise it will be 0 and operations won't work
-        converted_cql = re.sub(
-            r"(ST_GeomFromWKB\((.*?)\))", r"ST_SetSRID(\1, 4326)", converted_cql
-        )
-        where = where + converted_cql
-        return where
+
+
+@lru_cache(maxsize=1024)
+def _build_cql_where(
+    id: str, table_name: str, query: str, attribute_mapping: tuple
+) -> str:
+    """Convert a CQL query of a layer into a where clause."""
+    query = json.loads(query)
+    query_obj = CQLQuery(query=query)
+    ast = cql2_json_parser(query_obj.query)
+    attribute_mapping = {value: key for key, value in attribute_mapping}
+    # Add id to attribute mapping
+    attribute_mapping["id"] = "id"
+    attribute_mapping["geometry"] = "geom"
+    attribute_mapping["geom"] = "geom"
+    where = f"{table_name}.layer_id = '{str(id)}' AND "
+    converted_cql = re.sub(
+        r'(?<=\(|\s|,)"', f'{table_name}."', to_sql_where(ast, attribute_mapping)
+    )
+    # Fixing issue with pygeofilter https://github.com/geopython/pygeofilter/pull/54
+    converted_cql = converted_cql.replace("x'", "E'\\\\x")
+    # Add SRID to ST_GeomFromWKB otherwise it will be 0 and operations won't work
+    converted_cql = re.sub(
+        r"(ST_GeomFromWKB\((.*?)\))", r"ST_SetSRID(\1, 4326)", converted_cql
+    )
+    where = where + converted_cql
+    return where
 
 
 def build_where_clause(queries: [str]):
@@ -104,7 +104,7 @@ async def test_get_initial_view_state(
 
 @pytest.mark.asyncio
 async def test_update_initial_view_state(client: AsyncClient, fixture_create_project):
-    initial_view_state = initial_view_state_example
+    initial_view_state = dict(initial_view_state_example)
     initial_view_state["latitude"] = initial_view_state_example["latitude"] + 2
     initial_view_state["longitude"] = initial_view_state_example["longitude"] + 2
     initial_view_state["zoom"] = initial_view_state_example["zoom"] + 2
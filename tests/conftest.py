@@ -7,6 +7,7 @@ import time
 # Third party imports
 import pytest
 import pytest_asyncio
+from fastapi.encoders import jsonable_encoder
 from httpx import AsyncClient
 from sqlalchemy import text
 
@@ -30,6 +31,7 @@ from src.core.layer import get_user_table
 from tests.utils import (
     check_job_status,
     generate_random_string,
+    post_json,
     upload_file,
     upload_invalid_file,
     upload_valid_file,
@@ -47,8 +49,15 @@ def set_test_mode():
 
 set_test_mode()
 
+# Endpoint URLs used by the fixtures
+USER_URL = f"{settings.API_V2_STR}/user"
+FOLDER_URL = f"{settings.API_V2_STR}/folder"
+PROJECT_URL = f"{settings.API_V2_STR}/project"
+LAYER_URL = f"{settings.API_V2_STR}/layer"
 
-@pytest_asyncio.fixture
+
+# The app and base url do not change, share one client across the session
+@pytest_asyncio.fixture(scope="session")
 async def client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -80,12 +89,11 @@ async def session_fixture(event_loop):
     yield
     logging.info("Starting session_fixture finalizer")
     async with session_manager.connect() as connection:
-        pass
+        # Drop both test schemas in one statement
         await connection.execute(
-            text(f"""DROP SCHEMA IF EXISTS {settings.CUSTOMER_SCHEMA} CASCADE""")
-        )
-        await connection.execute(
-            text(f"""DROP SCHEMA IF EXISTS {settings.USER_DATA_SCHEMA} CASCADE""")
+            text(
+                f"""DROP SCHEMA IF EXISTS {settings.CUSTOMER_SCHEMA}, {settings.USER_DATA_SCHEMA} CASCADE"""
+            )
         )
     await session_manager.close()
     logging.info("Finished session_fixture finalizer")
@@ -109,26 +117,26 @@ async def db_session():
 @pytest.fixture
 async def fixture_create_user(client: AsyncClient):
     # Setup: Create the user
-    response = await client.post(f"{settings.API_V2_STR}/user")
+    response = await client.post(USER_URL)
     user = response.json()
     yield user
     # Teardown: Delete the user after the test
-    await client.delete(f"{settings.API_V2_STR}/user")
+    await client.delete(USER_URL)
 
 @pytest.fixture
 async def fixture_create_folder(client: AsyncClient, fixture_create_user):
     # Setup: Create the folder
-    response = await client.post(f"{settings.API_V2_STR}/folder", json={"name": "test"})
+    response = await post_json(client, FOLDER_URL, {"name": "test"})
     folder = response.json()
     yield folder
     # Teardown: Delete the folder after the test
-    await client.delete(f"{settings.API_V2_STR}/folder/{folder['id']}")
+    await client.delete(f"{FOLDER_URL}/{folder['id']}")
 
 
 @pytest.fixture
 async def fixture_get_home_folder(client: AsyncClient):
     response = await client.get(
-        f"{settings.API_V2_STR}/folder?search=home&order=descendent&page=1&size=1",
+        f"{FOLDER_URL}?search=home&order=descendent&page=1&size=1",
     )
     assert response.status_code == 200
     return response.json()[0]
@@ -139,45 +147,49 @@ async def fixture_create_exceed_folders(client: AsyncClient, fixture_create_user
     max_folder_cnt = settings.MAX_FOLDER_COUNT
     folder_names = [f"test{i}" for i in range(1, max_folder_cnt + 1)]
 
-    # Setup: Create multiple folders
-    cnt = 0
-    folder_ids = []
-    for name in folder_names:
-        cnt += 1
-        # Request to create a folder
-        response = await client.post(
-            f"{settings.API_V2_STR}/folder", json={"name": name}
+    # Setup: Create the folders below the limit concurrently
+    responses = await asyncio.gather(
+        *(
+            post_json(client, FOLDER_URL, {"name": name})
+            for name in folder_names[:-1]
         )
-        if cnt >= max_folder_cnt:
-            assert response.status_code == 429  # Too Many Requests
-        else:
-            assert response.status_code == 201
-            folder_ids.append(response.json()["id"])
+    )
+    folder_ids = []
+    for response in responses:
+        assert response.status_code == 201
+        folder_ids.append(response.json()["id"])
+
+    # Request to create the folder that exceeds the limit
+    response = await post_json(client, FOLDER_URL, {"name": folder_names[-1]})
+    assert response.status_code == 429  # Too Many Requests
 
     yield
     # Delete the folders after the test
-    for id in folder_ids:
-        await client.delete(f"{settings.API_V2_STR}/folder/{id}")
+    await asyncio.gather(*(client.delete(f"{FOLDER_URL}/{id}") for id in folder_ids))
 
 
 @pytest.fixture
 async def fixture_create_folders(client: AsyncClient, fixture_create_user):
     folder_names = ["test1", "test2", "test3"]
-    created_folders = []
 
     # Setup: Create multiple folders
-    for name in folder_names:
-        response = await client.post(
-            f"{settings.API_V2_STR}/folder", json={"name": name}
+    responses = await asyncio.gather(
+        *(
+            post_json(client, FOLDER_URL, {"name": name})
+            for name in folder_names
         )
-        folder = response.json()
-        created_folders.append(folder)
+    )
+    created_folders = [response.json() for response in responses]
 
     yield created_folders
 
     # Teardown: Delete the folders after the test
-    for folder in created_folders:
-        await client.delete(f"{settings.API_V2_STR}/folder/{folder['id']}")
+    await asyncio.gather(
+        *(
+            client.delete(f"{FOLDER_URL}/{folder['id']}")
+            for folder in created_folders
+        )
+    )
 
 
 @pytest.fixture
@@ -188,16 +200,18 @@ async def fixture_create_project(
     folder = fixture_create_folder
 
     # Setup: Create the project within the folder
-    example = project_request_examples["create"]
-    example["folder_id"] = folder["id"]
-    response = await client.post(f"{settings.API_V2_STR}/project", json=example)
+    example = {
+        **jsonable_encoder(project_request_examples["create"]),
+        "folder_id": folder["id"],
+    }
+    response = await post_json(client, PROJECT_URL, example)
     project = response.json()
 
     yield project
 
     # Teardown: Delete the project after the test
     # Note: Folder deletion will be handled by the fixture_create_folder fixture's teardown
-    await client.delete(f"{settings.API_V2_STR}/project/{project['id']}")
+    await client.delete(f"{PROJECT_URL}/{project['id']}")
 
 
 @pytest.fixture
@@ -210,21 +224,28 @@ async def fixture_create_projects(
     folder = fixture_create_folder
 
     # Setup: Create the project within the folder
-    example = project_request_examples["create"]
-    example["folder_id"] = folder["id"]
-    created_projects = []
-    for i in project_names:
-        example["name"] = i
-        response = await client.post(f"{settings.API_V2_STR}/project", json=example)
-        project = response.json()
-        created_projects.append(project)
+    example = {
+        **jsonable_encoder(project_request_examples["create"]),
+        "folder_id": folder["id"],
+    }
+    responses = await asyncio.gather(
+        *(
+            post_json(client, PROJECT_URL, {**example, "name": name})
+            for name in project_names
+        )
+    )
+    created_projects = [response.json() for response in responses]
 
     yield created_projects
 
     # Teardown: Delete the project after the test
     # Note: Folder deletion will be handled by the fixture_create_folder fixture's teardown
-    for project in created_projects:
-        await client.delete(f"{settings.API_V2_STR}/project/{project['id']}")
+    await asyncio.gather(
+        *(
+            client.delete(f"{PROJECT_URL}/{project['id']}")
+            for project in created_projects
+        )
+    )
 
 
 @pytest.fixture
@@ -239,7 +260,7 @@ async def fixture_create_layer_project(
     external_layer_id = external_layer["id"]
     # Add layers to project
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={internal_layer_id}&layer_ids={external_layer_id}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={internal_layer_id}&layer_ids={external_layer_id}"
     )
     assert response.status_code == 200
     layer_project = response.json()
@@ -250,7 +271,7 @@ async def fixture_create_layer_project(
         layer_project_ids.append(layer["id"])
 
     # Get Project
-    response = await client.get(f"{settings.API_V2_STR}/project/{project_id}")
+    response = await client.get(f"{PROJECT_URL}/{project_id}")
     assert response.status_code == 200
 
     # Check if layers are in layer order at right position
@@ -305,19 +326,20 @@ async def create_internal_layer(
     client: AsyncClient, dataset_id, fixture_get_home_folder, layer_type, project_id=None
 ):
     # Get feature layer dict and add layer ID
-    feature_layer_dict = layer_request_examples["create_internal"][layer_type]["value"]
+    # Examples are read-only, work on a plain copy
+    feature_layer_dict = jsonable_encoder(
+        layer_request_examples["create_internal"][layer_type]["value"]
+    )
     feature_layer_dict["name"] = generate_random_string(12)
     feature_layer_dict["dataset_id"] = dataset_id
     feature_layer_dict["folder_id"] = fixture_get_home_folder["id"]
 
     # Hit endpoint to create internal layer and add optional project_id
     if project_id:
-        url = f"{settings.API_V2_STR}/layer/internal?project_id={project_id}"
+        url = f"{LAYER_URL}/internal?project_id={project_id}"
     else:
-        url = f"{settings.API_V2_STR}/layer/internal"
-    response = await client.post(
-        url, json=feature_layer_dict
-    )
+        url = f"{LAYER_URL}/internal"
+    response = await post_json(client, url, feature_layer_dict)
     assert response.status_code == 201
 
     # Get job id
@@ -328,9 +350,7 @@ async def create_internal_layer(
     assert job["status_simple"] == "finished"
 
     # Get layer by name
-    response = await client.get(
-        f"{settings.API_V2_STR}/layer?search={feature_layer_dict['name']}"
-    )
+    response = await client.get(f"{LAYER_URL}?search={feature_layer_dict['name']}")
     assert response.status_code == 200
     layer_dict = response.json()["items"][0]
     return {**layer_dict, "job_id": job_id}
@@ -413,7 +433,7 @@ async def fixture_add_polygon_layer_to_project(
     project_id = fixture_create_project["id"]
     # Add layers to project
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_gpkg['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_gpkg['id']}"
     )
     assert response.status_code == 200
     layers_project = response.json()
@@ -445,7 +465,7 @@ async def fixture_add_large_polygon_layer_to_project(
     project_id = fixture_create_project["id"]
     # Add layers to project
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_gpkg['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_gpkg['id']}"
     )
     assert response.status_code == 200
     layers_project = response.json()
@@ -521,7 +541,7 @@ async def fixture_add_join_layers_to_project(
     project_id = fixture_create_project["id"]
     # Add layers to project
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_csv['id']}&layer_ids={layer_gpkg['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_csv['id']}&layer_ids={layer_gpkg['id']}"
     )
     assert response.status_code == 200
     layers_project = response.json()
@@ -548,14 +568,14 @@ async def fixture_add_aggregate_point_layers_to_project(
 
     # Add layers to project one by one and return layer_project_id
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_points['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_points['id']}"
     )
     assert response.status_code == 200
     layer_project_points = response.json()
     source_layer_project_id = layer_project_points[0]["id"]
 
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_polygons['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_polygons['id']}"
     )
     assert response.status_code == 200
     layer_project_polygons = response.json()
@@ -577,7 +597,7 @@ async def fixture_add_aggregate_point_layer_to_project(
 
     # Add layers to project one by one and return layer_project_id
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_points['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_points['id']}"
     )
     assert response.status_code == 200
     layer_project_points = response.json()
@@ -638,14 +658,14 @@ async def fixture_add_aggregate_polygon_layers_to_project(
 
     # Add layers to project one by one and return layer_project_id
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_source['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_source['id']}"
     )
     assert response.status_code == 200
     layer_project_source = response.json()
     source_layer_project_id = layer_project_source[0]["id"]
 
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_aggregation['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_aggregation['id']}"
     )
     assert response.status_code == 200
     layer_project_aggregation = response.json()
@@ -667,7 +687,7 @@ async def fixture_add_aggregate_polygon_layer_to_project(
 
     # Add layers to project one by one and return layer_project_id
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_source['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_source['id']}"
     )
     assert response.status_code == 200
     layer_project_source = response.json()
@@ -708,7 +728,7 @@ async def fixture_add_basic_layer_to_project(
     project_id = fixture_create_project["id"]
     # Add layers to project
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer['id']}"
     )
     assert response.status_code == 200
     layers_project = response.json()
@@ -748,7 +768,7 @@ async def fixture_add_origin_destination_layers_to_project(
 
     # Add layers to project one by one and return layer_project_id
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_origin_destination_matrix['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_origin_destination_matrix['id']}"
     )
     assert response.status_code == 200
     layer_project_origin_destination_matrix = response.json()
@@ -757,7 +777,7 @@ async def fixture_add_origin_destination_layers_to_project(
     )
 
     response = await client.post(
-        f"{settings.API_V2_STR}/project/{project_id}/layer?layer_ids={layer_geometry_layer['id']}"
+        f"{PROJECT_URL}/{project_id}/layer?layer_ids={layer_geometry_layer['id']}"
     )
     assert response.status_code == 200
     layer_project_geometry_layer = response.json()
@@ -772,15 +792,15 @@ async def fixture_add_origin_destination_layers_to_project(
 
 async def create_external_layer(client: AsyncClient, home_folder, layer_type):
     # Get table layer dict and add layer ID
-    external_layer_dict = layer_request_examples["create_external"][layer_type]["value"]
+    external_layer_dict = jsonable_encoder(
+        layer_request_examples["create_external"][layer_type]["value"]
+    )
     external_layer_dict["folder_id"] = home_folder["id"]
 
     # Give layer a random name
     external_layer_dict["name"] = generate_random_string(10)
     # Hit endpoint to create external layer
-    response = await client.post(
-        f"{settings.API_V2_STR}/layer/external", json=external_layer_dict
-    )
+    response = await post_json(client, f"{LAYER_URL}/external", external_layer_dict)
     assert response.status_code == 201
     return response.json()
 
@@ -835,14 +855,15 @@ async def fixture_create_internal_and_external_layer(
     client: AsyncClient, fixture_create_user, fixture_get_home_folder
 ):
     metadata = await upload_valid_file(client, "point")
-    internal_layer = await create_internal_layer(
-        client,
-        metadata["dataset_id"],
-        fixture_get_home_folder,
-        "feature_layer_standard",
-    )
-    external_layer = await create_external_layer(
-        client, fixture_get_home_folder, "external_vector_tile"
+    # The layers do not depend on each other, create them concurrently
+    internal_layer, external_layer = await asyncio.gather(
+        create_internal_layer(
+            client,
+            metadata["dataset_id"],
+            fixture_get_home_folder,
+            "feature_layer_standard",
+        ),
+        create_external_layer(client, fixture_get_home_folder, "external_vector_tile"),
     )
     return internal_layer, external_layer
 
@@ -863,11 +884,11 @@ async def fixture_delete_internal_layers(
 ):
     layer = fixture_create_internal_layers
     layer_id = layer["id"]
-    response = await client.delete(f"{settings.API_V2_STR}/layer/{layer_id}")
+    response = await client.delete(f"{LAYER_URL}/{layer_id}")
     assert response.status_code == 204
 
     # Check if layer is deleted
-    response = await client.get(f"{settings.API_V2_STR}/layer/{layer_id}")
+    response = await client.get(f"{LAYER_URL}/{layer_id}")
     assert response.status_code == 404  # Not Found
 
     # Get table name
@@ -890,10 +911,10 @@ async def fixture_delete_external_layers(
 ):
     layer = fixture_create_external_layers
     layer_id = layer["id"]
-    response = await client.delete(f"{settings.API_V2_STR}/layer/{layer_id}")
+    response = await client.delete(f"{LAYER_URL}/{layer_id}")
     assert response.status_code == 204
 
-    response = await client.get(f"{settings.API_V2_STR}/layer/{layer_id}")
+    response = await client.get(f"{LAYER_URL}/{layer_id}")
     assert response.status_code == 404  # Not Found
 
 
@@ -908,8 +929,8 @@ def create_generic_toolbox_fixture(endpoint: str, request_examples: dict):
     ):
         payload = request_examples[request.param]["value"]
         project_id = fixture_create_project["id"]
-        response = await client.post(
-            f"{settings.API_V2_STR}{endpoint}?project_id={project_id}", json=payload
+        response = await post_json(
+            client, f"{settings.API_V2_STR}{endpoint}?project_id={project_id}", payload
         )
         assert response.status_code == 201
         return response.json()
@@ -0,0 +1,57 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from src.crud.crud_isochrone import CRUDIsochronePT
+from src.schemas.error import R5EndpointError
+
+
+async def test_isochrone_pt_cancels_starting_points_on_r5_error():
+    # R5 fails for the first starting point and keeps processing the others
+    failing_lat = 48.1
+    calls = []
+
+    def handler(request: httpx.Request):
+        payload = json.loads(request.content)
+        calls.append(payload["fromLat"])
+        if payload["fromLat"] == failing_lat:
+            return httpx.Response(500, text="R5 failed")
+        return httpx.Response(202)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        crud_isochrone = CRUDIsochronePT(
+            job_id=uuid4(),
+            background_tasks=None,
+            async_session=None,
+            user_id=uuid4(),
+            project_id=None,
+            http_client=client,
+        )
+        region = {
+            "xmin": 11.0,
+            "ymin": 48.0,
+            "xmax": 12.0,
+            "ymax": 49.0,
+            "r5_region_id": "region",
+            "r5_bundle_id": "bundle",
+            "r5_host": "http://r5",
+        }
+
+        with pytest.raises(R5EndpointError):
+            await crud_isochrone.isochrone_starting_points(
+                params=None,
+                lats=[failing_lat, 48.2, 48.3],
+                lons=[11.5, 11.5, 11.5],
+                regions=[region, region, region],
+                request_payload={},
+                layer_id=str(uuid4()),
+                result_table="result_table",
+            )
+
+        # The other starting points were cancelled and stop polling R5
+        calls_after_error = len(calls)
+        await asyncio.sleep(1)
+        assert len(calls) == calls_after_error
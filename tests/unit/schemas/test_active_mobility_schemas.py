@@ -3,6 +3,7 @@ from pydantic import ValidationError
 
 from src.schemas.active_mobility import (
     TravelDistanceCostActiveMobility,
+    TravelTimeCostActiveMobility,
     IsochroneStartingPointsActiveMobility,
 )
 
@@ -34,4 +35,21 @@ def test_distance_step_divisible_by_50():
 def test_distance_step_not_divisible_by_50():
     # Test with a value that is not divisible by 50
     with pytest.raises(ValidationError):
-        TravelDistanceCostActiveMobility(max_distance=1000, distance_step=45)
\ No newline at end of file
+        TravelDistanceCostActiveMobility(max_distance=1000, distance_step=45)
+
+def test_steps_below_max_traveltime():
+    # Test with a number of steps that is below the maximum traveltime
+    try:
+        TravelTimeCostActiveMobility(max_traveltime=15, steps=5, speed=5)
+    except ValidationError:
+        pytest.fail("ValidationError was raised unexpectedly!")
+
+def test_steps_above_max_traveltime():
+    # Test with a number of steps that exceeds the maximum traveltime
+    with pytest.raises(ValidationError):
+        TravelTimeCostActiveMobility(max_traveltime=10, steps=20, speed=5)
+
+def test_steps_above_max_distance():
+    # Test with a number of steps that exceeds the maximum distance
+    with pytest.raises(ValidationError):
+        TravelDistanceCostActiveMobility(max_distance=50, steps=100)
@@ -1,8 +1,16 @@
 import pytest
+from fastapi.encoders import jsonable_encoder
+from geoalchemy2.shape import from_shape
 from pydantic import ValidationError
-from src.db.models.layer import DataCategory, DataLicense, LayerBase
-from src.schemas.layer import FeatureLayerExportType, IInternalLayerExport
-from uuid import uuid4
+from shapely.geometry import MultiPolygon, box
+from src.db.models.layer import DataCategory, DataLicense, LayerBase, LayerType
+from src.schemas.layer import (
+    FeatureLayerExportType,
+    IFeatureStandardRead,
+    IInternalLayerExport,
+    ILayerRead,
+)
+from uuid import UUID, uuid4
 
 def test_layer_base_creation():
     # Create a LayerBase instance with valid data
@@ -144,4 +152,31 @@ def test_internal_layer_export_invalid_crs_kml():
             file_type=FeatureLayerExportType.kml,
             file_name="test",
             crs=invalid_crs
-        )
\ No newline at end of file
+        )
+
+
+def test_layer_read_feature_layer_from_row():
+    # Read a feature layer as it comes from the database
+    extent = MultiPolygon([box(0, 0, 1, 1)])
+    layer_id = uuid4()
+    layer = ILayerRead(
+        id=str(layer_id),
+        user_id=str(uuid4()),
+        folder_id=str(uuid4()),
+        name="Test Layer",
+        type="feature",
+        feature_layer_type="standard",
+        feature_layer_geometry_type="point",
+        attribute_mapping={"text_attr1": "category"},
+        size=1000,
+        properties={"type": "circle", "paint": {}},
+        extent=from_shape(extent, srid=4326),
+    )
+
+    # Assert that the values were validated and the layer can be encoded
+    assert isinstance(layer, IFeatureStandardRead)
+    assert layer.id == layer_id
+    assert isinstance(layer.id, UUID)
+    assert layer.type == LayerType.feature
+    assert layer.extent == extent.wkt
+    assert jsonable_encoder(layer)["extent"] == extent.wkt
@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+from src.core.config import settings
+from src.schemas.project import IFeatureStandardProjectRead, ITableProjectRead
+
+
+def test_feature_standard_project_read_table_name_and_where_query():
+    # Create a feature layer project with a CQL query
+    user_id = uuid4()
+    layer_id = uuid4()
+    layer_project = IFeatureStandardProjectRead(
+        id=1,
+        layer_id=layer_id,
+        user_id=user_id,
+        folder_id=uuid4(),
+        name="Test Layer",
+        type="feature",
+        feature_layer_type="standard",
+        feature_layer_geometry_type="point",
+        attribute_mapping={"text_attr1": "category"},
+        size=1000,
+        properties={"type": "circle", "paint": {}},
+        query={"op": "=", "args": [{"property": "category"}, "bus_stop"]},
+    )
+
+    table_name = f"{settings.USER_DATA_SCHEMA}.point_{user_id.hex}"
+    assert layer_project.table_name == table_name
+    assert layer_project.where_query.startswith(
+        f"{table_name}.layer_id = '{layer_id}' AND "
+    )
+    assert f'{table_name}."text_attr1"' in layer_project.where_query
+
+
+def test_table_project_read_table_name_and_where_query():
+    # Create a table layer project without a query
+    user_id = uuid4()
+    layer_id = uuid4()
+    layer_project = ITableProjectRead(
+        id=1,
+        layer_id=layer_id,
+        user_id=user_id,
+        folder_id=uuid4(),
+        name="Test Table",
+        type="table",
+        attribute_mapping={"text_attr1": "category"},
+    )
+
+    table_name = f"{settings.USER_DATA_SCHEMA}.no_geometry_{user_id.hex}"
+    assert layer_project.table_name == table_name
+    assert layer_project.where_query == f"{table_name}.layer_id = '{layer_id}'"
+    assert layer_project.total_count is None
+    assert layer_project.filtered_count is None
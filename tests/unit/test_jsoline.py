@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.jsoline import generate_jsolines, generate_jsolines_from_r5_bytes
+from src.utils import decode_r5_grid
+
+WIDTH = 12
+HEIGHT = 10
+
+
+def build_r5_grid(depth: int) -> bytes:
+    """Build a synthetic ACCESSGR response with one surface per percentile."""
+
+    # Travel times grow with the distance to the center of the grid
+    y, x = np.mgrid[0:HEIGHT, 0:WIDTH]
+    distance = np.hypot(x - WIDTH / 2, y - HEIGHT / 2)
+    surfaces = [
+        (distance * 3 + percentile_index * 2).astype(np.int32).ravel()
+        for percentile_index in range(depth)
+    ]
+
+    # Header: type, version, zoom, west, north, width, height, depth
+    header = b"ACCESSGR" + np.array(
+        [0, 9, 68700, 45000, WIDTH, HEIGHT, depth], dtype="<i4"
+    ).tobytes()
+    # Each surface is delta encoded
+    data = b"".join(
+        np.diff(surface, prepend=0).astype("<i4").tobytes() for surface in surfaces
+    )
+    metadata = json.dumps({"scenarioApplicationWarnings": []}).encode()
+    return header + data + metadata
+
+
+@pytest.mark.parametrize("depth,percentile", [(1, 50), (5, 5), (5, 75)])
+def test_generate_jsolines_from_r5_bytes_matches_decoded_grid(depth, percentile):
+    result = build_r5_grid(depth)
+
+    expected = generate_jsolines(
+        grid=decode_r5_grid(result),
+        travel_time=30,
+        percentile=percentile,
+        steps=6,
+    )
+    isochrones = generate_jsolines_from_r5_bytes(
+        result=result,
+        travel_time=30,
+        percentile=percentile,
+        steps=6,
+    )
+
+    for key in ["full", "incremental"]:
+        assert list(isochrones[key]["minute"]) == list(expected[key]["minute"])
+        # Both paths feed the same surface to jsolines, so the shapes are identical
+        assert list(isochrones[key].geometry.to_wkb()) == list(
+            expected[key].geometry.to_wkb()
+        )
@@ -5,6 +5,7 @@ import string
 from typing import List
 from uuid import uuid4
 
+import orjson
 from httpx import AsyncClient
 
 from src.core.config import settings
@@ -12,6 +13,16 @@ from src.schemas.job import JobStatusType
 from src.schemas.toolbox_base import ColumnStatisticsOperation
 
 
+async def post_json(client: AsyncClient, url: str, payload: dict):
+    """Post a JSON payload encoded with orjson."""
+
+    return await client.post(
+        url,
+        content=orjson.dumps(payload),
+        headers={"content-type": "application/json"},
+    )
+
+
 async def check_job_status(
     client: AsyncClient, job_id: str, target_status: str = JobStatusType.finished.value
 ):
@@ -222,9 +233,10 @@ async def test_aggregate(
             params["h3_resolution"] = 10
 
 
-        response = await client.post(
+        response = await post_json(
+            client,
             f"{settings.API_V2_STR}/tool/aggregate-{aggregate_type}?project_id={project_id}",
-            json=params,
+            params,
         )
         assert response.status_code == 201
         job = await check_job_status(client, response.json()["job_id"])